@@ -1,7 +1,8 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from unfold.admin import ModelAdmin  # Unfold's ModelAdmin
-from .models import User
+from quickcheck.paginators import EstimatedCountPaginator
+from .models import User, EmailDomainCount
 from django.utils.translation import gettext_lazy as _
 
 
@@ -15,8 +16,12 @@ class UserAdmin(BaseUserAdmin, ModelAdmin):
     model = User
     ordering = ['email']
     list_display = ['id', 'email', 'first_name', 'last_name', 'is_staff', 'is_verified', 'is_superuser', 'auth_provider', 'get_groups_display']
-    search_fields = ['id', 'email', 'first_name', 'last_name']
+    # Exact matches only, each served by an index
+    search_fields = ['=id', '=email', '=email_domain']
     list_filter = ['is_active', 'is_staff', 'is_superuser']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
 
     fieldsets = (
         (None, {'fields': ('email', 'password')}),
@@ -35,6 +40,10 @@ class UserAdmin(BaseUserAdmin, ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        # One groups query per page instead of one per row
+        return super().get_queryset(request).prefetch_related('groups')
+
     def get_groups_display(self, obj):
         return ", ".join([group.name for group in obj.groups.all()])
 
@@ -42,3 +51,11 @@ class UserAdmin(BaseUserAdmin, ModelAdmin):
 
 
 admin.site.register(User, UserAdmin)
+
+
+@admin.register(EmailDomainCount)
+class EmailDomainCountAdmin(ModelAdmin):
+    list_display = ('domain', 'user_count')
+    search_fields = ('domain',)
+    ordering = ('-user_count',)
+    readonly_fields = ('domain', 'user_count')
@@ -6,5 +6,5 @@ class AccountConfig(AppConfig):
     name = 'account'
 
 
-    
-
+    def ready(self):
+        import account.signals
@@ -0,0 +1,9 @@
+from django.urls import path
+from . import async_views
+
+# Served instead of the matching account/urls.py routes under ASGI; anything
+# not listed here falls through to the DRF views
+urlpatterns = [
+    path('registration/', async_views.registration_view, name='register'),
+    path('login/', async_views.login_view, name='login'),
+]
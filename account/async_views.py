@@ -0,0 +1,73 @@
+"""
+Native async login and registration, routed in place of the DRF views for
+requests arriving through quickcheck/asgi.py (see
+quickcheck.middleware.asgi_urlconf_middleware). Passwords are hashed in the
+bounded pool from account.hashers, so a slow hash never pins the event loop
+or the ORM thread. Requests, responses and errors match the sync views.
+"""
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, status
+from .serializers import RegistrationSerializer, AsyncLoginSerializer
+from .hashers import ahash_password
+from rest_framework_simplejwt.tokens import RefreshToken
+from quickcheck.async_api import error_response, parse_post
+from quickcheck.log import bind_log_context
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@csrf_exempt
+async def registration_view(request):
+    """
+    Handles user registration. Validation uses the ORM thread and the
+    password is hashed in the bounded hash pool.
+    """
+    try:
+        data = parse_post(request)
+    except exceptions.APIException as exc:
+        return error_response(exc)
+
+    serializer = RegistrationSerializer(data=data)
+    if not await sync_to_async(serializer.is_valid)():
+        return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    password_hash = await ahash_password(serializer.validated_data['password'])
+    await sync_to_async(serializer.save)(password_hash=password_hash)
+
+    logger.info("New user registered: %s", serializer.validated_data.get('email'))
+
+    return JsonResponse({'message': 'Registration successful'}, status=status.HTTP_201_CREATED)
+
+
+@csrf_exempt
+async def login_view(request):
+    """
+    Handles user login and returns JWT tokens. The password check runs in
+    the bounded hash pool.
+    """
+    try:
+        data = parse_post(request)
+    except exceptions.APIException as exc:
+        return error_response(exc)
+
+    serializer = AsyncLoginSerializer(data=data)
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        user = await serializer.aauthenticate()
+    except exceptions.ValidationError as exc:
+        return error_response(exc)
+
+    refresh = await sync_to_async(RefreshToken.for_user)(user)
+
+    bind_log_context(user_id=str(user.pk))
+    logger.info("User %s logged in successfully", user.email)
+
+    return JsonResponse({
+        'refresh': str(refresh),
+        'access': str(refresh.access_token),
+    }, status=status.HTTP_200_OK)
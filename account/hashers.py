@@ -0,0 +1,79 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    PBKDF2PasswordHasher as BasePBKDF2PasswordHasher,
+    check_password,
+    get_hasher,
+    identify_hasher,
+    make_password,
+)
+
+
+class PBKDF2PasswordHasher(BasePBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with the work factor taken from PASSWORD_HASH_ITERATIONS.
+    Hashes made with another count are upgraded on the next login.
+    """
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASH_ITERATIONS
+
+
+_executor = None
+
+
+def get_hash_executor():
+    """
+    Bounded pool for password hashing, sized by PASSWORD_HASH_WORKERS. Kept
+    apart from asgiref's thread-sensitive executor so slow hashes never
+    queue behind (or block) ORM calls.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix='password-hash'
+        )
+    return _executor
+
+
+async def run_hashing(func, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_hash_executor(), func, *args)
+
+
+async def ahash_password(password):
+    return await run_hashing(make_password, password)
+
+
+async def acheck_password(user, password):
+    """
+    Async User.check_password. The hash runs in the pool; an outdated hash
+    (other algorithm or iteration count) is replaced with a single UPDATE.
+    """
+    if not await run_hashing(check_password, password, user.password):
+        return False
+
+    hasher = identify_hasher(user.password)
+    if hasher.algorithm != get_hasher().algorithm or hasher.must_update(user.password):
+        user.password = await ahash_password(password)
+        await type(user).objects.filter(pk=user.pk).aupdate(password=user.password)
+    return True
+
+
+async def aauthenticate(user_model, email, password):
+    """
+    Async counterpart of ModelBackend.authenticate for email logins: returns
+    the active user whose password matches, otherwise None.
+    """
+    try:
+        user = await user_model.objects.aget(email=email)
+    except user_model.DoesNotExist:
+        # Hash anyway so unknown emails take as long as wrong passwords
+        await ahash_password(password)
+        return None
+
+    if await acheck_password(user, password) and user.is_active:
+        return user
+    return None
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes expired outstanding refresh tokens and their blacklist entries in chunks, "
+        "so the token tables stay small without one long-running DELETE. Run it from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help="Outstanding tokens deleted per transaction.")
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        now = timezone.now()
+        expired = OutstandingToken.objects.filter(expires_at__lte=now).order_by('id')
+
+        outstanding = blacklisted = 0
+        while True:
+            ids = list(expired.values_list('id', flat=True)[:chunk_size])
+            if not ids:
+                break
+
+            # BlacklistedToken rows go with their token in the same transaction
+            with transaction.atomic():
+                deleted, per_model = OutstandingToken.objects.filter(id__in=ids).delete()
+            outstanding += per_model.get('token_blacklist.OutstandingToken', 0)
+            blacklisted += per_model.get('token_blacklist.BlacklistedToken', 0)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Pruned {outstanding} expired outstanding token(s) and {blacklisted} blacklist entr(y/ies)."
+        ))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Value
+from django.db.models.functions import Lower, StrIndex, Substr
+
+from account.models import User, EmailDomainCount
+
+
+class Command(BaseCommand):
+    help = "Backfills User.email_domain and rebuilds the per-domain user counts."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            # Fill the domain for rows created before the column existed
+            backfilled = User.objects.filter(email_domain='').update(
+                email_domain=Lower(Substr('email', StrIndex('email', Value('@')) + 1))
+            )
+
+            EmailDomainCount.objects.all().delete()
+            rows = (
+                User.objects.exclude(email_domain='')
+                .values('email_domain')
+                .annotate(total=Count('id'))
+                .order_by()
+            )
+            counts = EmailDomainCount.objects.bulk_create(
+                [EmailDomainCount(domain=row['email_domain'], user_count=row['total']) for row in rows],
+                batch_size=1000,
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Backfilled {backfilled} user(s); rebuilt counts for {len(counts)} domain(s)."
+        ))
@@ -1,9 +1,19 @@
 # Create your models here.
-from django.db import models
+from django.db import models, transaction, IntegrityError
+from django.db.models import F
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager,PermissionsMixin,Group
 import uuid
 
 
+def email_domain_of(email):
+    """
+    Returns the normalized (lower-cased) domain part of an email address.
+    """
+    if not email:
+        return ''
+    return email.rsplit('@', 1)[-1].lower()
+
+
 
 
 
@@ -23,7 +33,7 @@ class UserManager(BaseUserManager):
         
         email =self.normalize_email(email).lower()
 
-        user = self.model(email=email, first_name=first_name, last_name=last_name)
+        user = self.model(email=email, email_domain=email_domain_of(email), first_name=first_name, last_name=last_name)
         user.set_password(password)
         user.save(using=self._db)
         return user
@@ -44,6 +54,7 @@ AUTH_PROVIDERS = {'email': 'email'}
 class User(AbstractBaseUser, PermissionsMixin):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     email = models.EmailField(max_length=255, unique=True)
+    email_domain = models.CharField(max_length=255, blank=True, editable=False)
     first_name = models.CharField(max_length=255)
     last_name = models.CharField(max_length=255)
     is_active = models.BooleanField(default=True)
@@ -62,6 +73,10 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     objects = UserManager()
 
+    # Domain as last read from / written to the database, used to keep
+    # EmailDomainCount in step when a user's email changes.
+    _loaded_email_domain = None
+
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
     
@@ -74,11 +89,69 @@ class User(AbstractBaseUser, PermissionsMixin):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['email']),
+            models.Index(fields=['email_domain']),
         ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'email_domain' in field_names:
+            instance._loaded_email_domain = values[field_names.index('email_domain')]
+        return instance
     
     def save(self, *args, **kwargs):
         self.email = self.email.lower()
-        super(User, self).save(*args, **kwargs)
+        self.email_domain = email_domain_of(self.email)
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'email' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | {'email_domain'}
+
+        # The domain counter is updated from post_save, keep both writes together
+        with transaction.atomic(using=kwargs.get('using')):
+            super(User, self).save(*args, **kwargs)
+
+
+
+class EmailDomainCount(models.Model):
+    """
+    Number of registered users per email domain, kept up to date by the
+    account signals so fraud checks can read it with a single keyed lookup.
+    """
+    domain = models.CharField(max_length=255, unique=True)
+    user_count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.domain} ({self.user_count} users)"
+
+    @classmethod
+    def get_user_count(cls, domain):
+        """
+        Returns the number of users registered under ``domain``.
+        """
+        try:
+            return cls.objects.only('user_count').get(domain=domain).user_count
+        except cls.DoesNotExist:
+            return 0
+
+    @classmethod
+    def adjust(cls, domain, delta):
+        """
+        Atomically adds ``delta`` to the counter of ``domain``, creating the row if needed.
+        """
+        if not domain or not delta:
+            return
+
+        updated = cls.objects.filter(domain=domain).update(user_count=F('user_count') + delta)
+        if updated or delta < 0:
+            return
+
+        try:
+            with transaction.atomic():
+                cls.objects.create(domain=domain, user_count=delta)
+        except IntegrityError:
+            # Another transaction created the row first
+            cls.objects.filter(domain=domain).update(user_count=F('user_count') + delta)
 
 
 
@@ -1,8 +1,10 @@
 from rest_framework import serializers
 from .models import *
 from django.contrib.auth import authenticate
+from rest_framework.settings import api_settings
 from django.contrib.auth.password_validation import validate_password
 from rest_framework_simplejwt.tokens import RefreshToken, TokenError
+from .hashers import aauthenticate
 
 from django.contrib.auth import get_user_model
 
@@ -29,7 +31,7 @@ class RegistrationSerializer(serializers.ModelSerializer):
         if attrs['password'] != attrs['password2']:
             raise serializers.ValidationError({"password": "Passwords do not match."})
         
-        validate_password(attrs['password'])
+        # Password strength is already checked by the field's validate_password validator
         return attrs
     
 
@@ -43,16 +45,20 @@ class RegistrationSerializer(serializers.ModelSerializer):
         return value
 
     def create(self, validated_data):
-        # Remove password2 and create user
+        # Remove password2 and create user; a `password_hash` passed to save() was computed in the hash pool
 
         validated_data.pop('password2')
+        password_hash = validated_data.pop('password_hash', None)
         validated_data['email'] = validated_data['email'].lower()
         user = User(
             email=validated_data['email'],
             first_name=validated_data['first_name'],
             last_name=validated_data['last_name'],
         )
-        user.set_password(validated_data['password'])
+        if password_hash:
+            user.password = password_hash
+        else:
+            user.set_password(validated_data['password'])
         user.save()
         return user
 
@@ -87,6 +93,42 @@ class LoginSerializer(serializers.Serializer):
     
 
 
+class AsyncLoginSerializer(LoginSerializer):
+    """
+    LoginSerializer for the async login view: validate() only checks the
+    fields, and the credentials are checked by aauthenticate(), which hashes
+    in the password pool.
+    """
+
+    def validate(self, attrs):
+        email = attrs.get('email')
+        password = attrs.get('password')
+
+        if not (email and password):
+            raise serializers.ValidationError("Must include 'email' and 'password'.")
+
+        attrs['email'] = email.lower()
+        return attrs
+
+    async def aauthenticate(self):
+        """
+        Checks the validated credentials and returns the user. Failures raise
+        ValidationError with the errors LoginSerializer.validate() reports.
+        """
+        user = await aauthenticate(User, self.validated_data['email'], self.validated_data['password'])
+        if not user:
+            raise self.non_field_error("Invalid credentials.", code='authorization')
+        if not user.is_active:
+            raise self.non_field_error("User account is disabled.")
+        if not user.is_verified:
+            raise self.non_field_error("Email is not verified.")
+        return user
+
+    def non_field_error(self, message, code='invalid'):
+        return serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [message]}, code=code)
+    
+
+
 
 class LogoutSerializer(serializers.Serializer):
     refresh = serializers.CharField()
@@ -98,7 +140,8 @@ class LogoutSerializer(serializers.Serializer):
             raise serializers.ValidationError("Refresh token cannot be empty")
 
         try:
-            RefreshToken(value)
+            # Kept for save() so the blacklist is only checked once
+            self.token = RefreshToken(value)
         except TokenError:
             raise serializers.ValidationError("Invalid or expired refresh token")
 
@@ -107,9 +150,5 @@ class LogoutSerializer(serializers.Serializer):
     def save(self, **kwargs):
         # Blacklist refresh token
         
-        token = RefreshToken(self.validated_data['refresh'])
-        token.blacklist()
-
-
-
+        self.token.blacklist()
 
@@ -0,0 +1,39 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .authentication import user_cache
+from .models import User, EmailDomainCount
+
+
+@receiver(post_save, sender=User)
+def track_email_domain_on_save(sender, instance, created, **kwargs):
+    """
+    Keeps EmailDomainCount in step with user creation and email changes.
+    """
+    previous = instance._loaded_email_domain
+    current = instance.email_domain
+
+    if created:
+        EmailDomainCount.adjust(current, 1)
+    elif previous is not None and previous != current:
+        EmailDomainCount.adjust(previous, -1)
+        EmailDomainCount.adjust(current, 1)
+
+    instance._loaded_email_domain = current
+
+
+@receiver(post_delete, sender=User)
+def track_email_domain_on_delete(sender, instance, **kwargs):
+    """
+    Decrements the domain counter when a user is removed.
+    """
+    EmailDomainCount.adjust(instance._loaded_email_domain or instance.email_domain, -1)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """
+    Drops the cached row used by CachedJWTAuthentication (e.g. on deactivation).
+    """
+    user_cache.invalidate(str(instance.pk))
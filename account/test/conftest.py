@@ -2,10 +2,35 @@
 import pytest
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
+from account.authentication import user_cache
 
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    """
+    Authenticated users cached by one test must not leak into the next.
+    """
+    user_cache.clear()
+    yield
+    user_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budgets(request, settings):
+    """
+    Any request that runs more queries than its QUERY_BUDGETS entry fails
+    the test. `@pytest.mark.query_budget(url_name=n)` overrides budgets for
+    one test.
+    """
+    settings.QUERY_BUDGET_ENFORCE = True
+    settings.QUERY_BUDGET_ACTION = 'raise'
+    marker = request.node.get_closest_marker('query_budget')
+    if marker:
+        settings.QUERY_BUDGETS = {**settings.QUERY_BUDGETS, **marker.kwargs}
+
+
 @pytest.fixture
 def api_client():
     return APIClient()
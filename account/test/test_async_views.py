@@ -0,0 +1,56 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+from account.serializers import LoginSerializer
+
+
+def async_post(url, data, content_type="application/json"):
+    return async_to_sync(AsyncClient().post)(url, data=data, content_type=content_type)
+
+
+@pytest.mark.django_db
+def test_async_login_matches_the_drf_view(api_client, login_payload, user):
+    response = async_post("/account/login/", login_payload)
+
+    assert response.status_code == 200
+    assert set(response.json()) == set(api_client.post("/account/login/", data=login_payload, format="json").data)
+
+
+@pytest.mark.django_db
+def test_async_login_errors_match_the_drf_view(api_client, user):
+    payload = {"email": user.email, "password": "wrong"}
+    response = async_post("/account/login/", payload)
+
+    assert response.status_code == 400
+    assert response.json() == api_client.post("/account/login/", data=payload, format="json").data
+
+
+@pytest.mark.django_db
+def test_async_registration_accepts_form_bodies(user):
+    response = async_to_sync(AsyncClient().post)("/account/registration/", data={
+        "email": "ada@quickcheck.com", "first_name": "Ada", "last_name": "Obi",
+        "password": "Testseries1@", "password2": "Testseries1@",
+    })
+
+    assert response.status_code == 201
+    assert response.json() == {"message": "Registration successful"}
+
+
+def test_async_views_reject_other_methods_as_drf_does():
+    response = async_to_sync(AsyncClient().get)("/account/login/")
+
+    assert response.status_code == 405
+    assert response.json() == {"detail": 'Method "GET" not allowed.'}
+
+
+@pytest.mark.django_db
+def test_login_serializer_authenticates(user):
+    serializer = LoginSerializer(data={"email": user.email, "password": "wrong"})
+
+    assert not serializer.is_valid()
+    assert serializer.errors == {"non_field_errors": ["Invalid credentials."]}
+
+    serializer = LoginSerializer(data={"email": user.email.upper(), "password": "Testseries1@"})
+    assert serializer.is_valid()
+    assert serializer.validated_data["user"] == user
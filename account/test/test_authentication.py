@@ -0,0 +1,61 @@
+import pytest
+from rest_framework.test import APIRequestFactory
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from account.authentication import CachedJWTAuthentication
+
+
+@pytest.fixture
+def token_request(user):
+    token = RefreshToken.for_user(user).access_token
+    return APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+
+
+@pytest.mark.django_db
+def test_repeat_authentication_skips_the_database(user, token_request, django_assert_num_queries):
+    auth = CachedJWTAuthentication()
+
+    with django_assert_num_queries(1):
+        first, _ = auth.authenticate(token_request)
+    with django_assert_num_queries(0):
+        second, _ = auth.authenticate(token_request)
+
+    assert first == second == user
+    assert first is not second
+
+
+@pytest.mark.django_db
+def test_request_changes_to_the_user_do_not_reach_the_cache(user, token_request):
+    auth = CachedJWTAuthentication()
+
+    first, _ = auth.authenticate(token_request)
+    first.first_name = "Changed"
+    first.is_staff = True
+    second, _ = auth.authenticate(token_request)
+
+    assert second.first_name == user.first_name
+    assert not second.is_staff
+
+
+@pytest.mark.django_db
+def test_deactivated_user_is_rejected_immediately(user, token_request):
+    auth = CachedJWTAuthentication()
+    auth.authenticate(token_request)
+
+    user.is_active = False
+    user.save()
+
+    with pytest.raises(AuthenticationFailed):
+        auth.authenticate(token_request)
+
+
+@pytest.mark.django_db
+def test_loan_views_do_not_look_up_the_url_user(auth_client, user, django_assert_num_queries):
+    auth_client.get(f"/loan/retrieve-all-loans/{user.id}/")
+
+    # Cached authentication, then COUNT(*) only: the page query is skipped when empty
+    with django_assert_num_queries(1):
+        response = auth_client.get(f"/loan/retrieve-all-loans/{user.id}/")
+
+    assert response.status_code == 200
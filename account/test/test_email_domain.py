@@ -0,0 +1,53 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from account.models import User, EmailDomainCount
+from loan.utils import check_fraud_conditions
+
+
+def make_user(email):
+    return User.objects.create_user(email=email, first_name="Test", last_name="User", password="Testseries1@")
+
+
+@pytest.mark.django_db
+def test_domain_count_follows_create_update_delete():
+    first = make_user("one@Example.com")
+    make_user("two@example.com")
+
+    assert first.email_domain == "example.com"
+    assert EmailDomainCount.get_user_count("example.com") == 2
+
+    first.email = "one@other.org"
+    first.save()
+    assert EmailDomainCount.get_user_count("example.com") == 1
+    assert EmailDomainCount.get_user_count("other.org") == 1
+
+    User.objects.filter(email_domain="example.com").delete()
+    assert EmailDomainCount.get_user_count("example.com") == 0
+
+
+@pytest.mark.django_db
+def test_rebuild_domain_counts_backfills_and_recounts():
+    for i in range(3):
+        make_user(f"user{i}@corp.io")
+    User.objects.update(email_domain="")
+    EmailDomainCount.objects.all().delete()
+
+    call_command("rebuild_domain_counts")
+
+    assert set(User.objects.values_list("email_domain", flat=True)) == {"corp.io"}
+    assert EmailDomainCount.get_user_count("corp.io") == 3
+
+
+@pytest.mark.django_db
+def test_domain_rule_does_not_scan_user_table(user):
+    with CaptureQueriesContext(connection) as ctx:
+        check_fraud_conditions(user, 1000)
+
+    assert not any("account_user" in query["sql"] for query in ctx.captured_queries)
+
+    plan = EmailDomainCount.objects.filter(domain=user.email_domain).explain()
+    assert "SCAN" not in plan
+    assert "USING INDEX" in plan
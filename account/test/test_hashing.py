@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import time
+import pytest
+import logging
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+from account import hashers
+from account.hashers import PBKDF2PasswordHasher
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture
+def fast_hashing(settings):
+    settings.PASSWORD_HASH_ITERATIONS = 50_000
+
+
+@pytest.mark.django_db
+def test_wrong_password_is_rejected(api_client, user):
+    response = api_client.post("/account/login/", data={"email": user.email, "password": "wrong"}, format="json")
+
+    assert response.status_code == 400
+    assert response.json() == {"non_field_errors": ["Invalid credentials."]}
+
+
+@pytest.mark.django_db
+@pytest.mark.query_budget(login=5)  # the one-off rehash adds a savepoint-wrapped UPDATE
+def test_login_upgrades_hash_to_configured_iterations(api_client, login_payload, user, fast_hashing):
+    response = api_client.post("/account/login/", data=login_payload, format="json")
+
+    assert response.status_code == 200
+    user.refresh_from_db()
+    algorithm, iterations, salt, digest = user.password.split("$")
+    assert algorithm == PBKDF2PasswordHasher.algorithm
+    assert int(iterations) == 50_000
+
+
+@pytest.mark.django_db
+def test_async_login_hashes_in_the_pool(user, login_payload, monkeypatch):
+    threads = []
+    original = hashers.check_password
+    monkeypatch.setattr(hashers, "check_password", lambda *args: threads.append(threading.current_thread().name) or original(*args))
+
+    response = async_to_sync(AsyncClient().post)("/account/login/", data=login_payload, content_type="application/json")
+
+    assert response.status_code == 200
+    assert threads and all(name.startswith("password-hash") for name in threads)
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_concurrent_login_benchmark(user, login_payload, fast_hashing):
+    """
+    Logins per second, one at a time and 32 concurrently, through the ASGI
+    handler, and the longest event loop stall while passwords hash.
+    """
+    size = 32
+    client = AsyncClient()
+
+    async def login():
+        response = await client.post("/account/login/", data=login_payload, content_type="application/json")
+        return response.status_code
+
+    async def heartbeat(gaps, done):
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(0.005)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    async def run():
+        await login()  # Upgrade the stored hash to the benchmark's iteration count
+
+        started = time.perf_counter()
+        sequential = [await login() for _ in range(size)]
+        sequential_elapsed = time.perf_counter() - started
+
+        gaps, done = [], asyncio.Event()
+        ticker = asyncio.create_task(heartbeat(gaps, done))
+        started = time.perf_counter()
+        concurrent = await asyncio.gather(*(login() for _ in range(size)))
+        concurrent_elapsed = time.perf_counter() - started
+        done.set()
+        await ticker
+        return sequential, sequential_elapsed, concurrent, concurrent_elapsed, max(gaps)
+
+    sequential, sequential_elapsed, concurrent, concurrent_elapsed, max_gap = async_to_sync(run)()
+
+    logger.info(
+        "%s logins sequential: %.1f logins/s | concurrent: %.1f logins/s | longest event loop stall: %.1fms",
+        size, size / sequential_elapsed, size / concurrent_elapsed, max_gap * 1000,
+    )
+    assert set(sequential) == set(concurrent) == {200}
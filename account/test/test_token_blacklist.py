@@ -0,0 +1,47 @@
+import pytest
+from datetime import timedelta
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken, TokenError
+
+
+@pytest.mark.django_db
+def test_rotated_refresh_token_is_rejected(api_client, user, login_payload):
+    refresh = api_client.post("/account/login/", data=login_payload, format="json").data["refresh"]
+
+    response = api_client.post("/account/token/refresh/", data={"refresh": refresh}, format="json")
+    assert response.status_code == 200
+
+    response = api_client.post("/account/token/refresh/", data={"refresh": refresh}, format="json")
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db
+def test_tokens_blacklisted_by_another_process_are_rejected_at_once(user):
+    refresh = RefreshToken.for_user(user)
+    RefreshToken(str(refresh))
+
+    # Written directly, as another worker process would
+    outstanding = OutstandingToken.objects.get(jti=refresh['jti'])
+    BlacklistedToken.objects.create(token=outstanding)
+
+    with pytest.raises(TokenError):
+        RefreshToken(str(refresh))
+
+
+@pytest.mark.django_db
+def test_prune_tokens_deletes_expired_rows_in_chunks(user):
+    now = timezone.now()
+    for i in range(5):
+        expired = OutstandingToken.objects.create(
+            user=user, jti=f"expired-{i}", token="x", expires_at=now - timedelta(hours=1)
+        )
+        BlacklistedToken.objects.create(token=expired)
+    live = OutstandingToken.objects.create(user=user, jti="live", token="x", expires_at=now + timedelta(hours=1))
+    BlacklistedToken.objects.create(token=live)
+
+    call_command("prune_tokens", chunk_size=2)
+
+    assert list(OutstandingToken.objects.values_list("jti", flat=True)) == ["live"]
+    assert BlacklistedToken.objects.count() == 1
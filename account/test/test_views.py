@@ -73,3 +73,20 @@ def test_user_login(api_client, login_payload, user):
 
 
 
+
+
+@pytest.mark.django_db
+def test_user_logout(api_client, login_payload, user):
+    """
+    Logging out blacklists the refresh token, within the logout query budget
+    (enforced by the autouse enforce_query_budgets fixture).
+    """
+    tokens = api_client.post("/account/login/", data=login_payload, format="json").json()
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+
+    response = api_client.post("/account/logout/", data={"refresh": tokens["refresh"]}, format="json")
+
+    logger.info("Logout queries: %s", response['X-Query-Count'])
+
+    assert response.status_code == 200
+    assert response.json()["message"] == "Successfully logged out"
@@ -5,6 +5,7 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from .serializers import RegistrationSerializer, LoginSerializer, LogoutSerializer
 from rest_framework_simplejwt.tokens import RefreshToken
+from quickcheck.log import bind_log_context
 from django.contrib.auth import get_user_model
 import logging
 
@@ -21,7 +22,7 @@ def registration_view(request):
     serializer.is_valid(raise_exception=True)
     serializer.save()
 
-    logger.info(f"New user registered: {serializer.validated_data.get('email')}")
+    logger.info("New user registered: %s", serializer.validated_data.get('email'))
     
     return Response({'message': 'Registration successful'}, status=status.HTTP_201_CREATED)
 
@@ -37,7 +38,8 @@ def login_view(request):
     user = serializer.validated_data['user']
     refresh = RefreshToken.for_user(user)
 
-    logger.info(f"User {user.email} logged in successfully")
+    bind_log_context(user_id=str(user.pk))
+    logger.info("User %s logged in successfully", user.email)
     
     return Response({
         'refresh': str(refresh),
@@ -57,7 +59,7 @@ def logout_view(request):
     serializer.is_valid(raise_exception=True)
     serializer.save()
 
-    logger.info(f"User {request.user.email} logged out successfully")
+    logger.info("User %s logged out successfully", request.user.email)
 
     return Response(
         {"message": "Successfully logged out"},
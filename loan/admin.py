@@ -1,18 +1,87 @@
 from unfold.admin import ModelAdmin  
 from django.contrib import admin
-from .models import LoanApplication, FraudFlag
+from quickcheck.paginators import EstimatedCountPaginator
+from .models import LoanApplication, FraudFlag, FraudCheckJob, OutboundEmail, LoanDailyStat
+from .utils import bulk_update_status
 
 
 @admin.register(LoanApplication)
 class LoanApplicationAdmin(ModelAdmin): 
     list_display = ('id', 'user', 'amount_requested', 'status', 'date_applied')
     list_filter = ('status', 'date_applied')
-    search_fields = ('user__username', 'purpose', 'status')
-    ordering = ('-date_applied',)
+    list_select_related = ('user',)
+    # Exact matches only, each served by an index
+    search_fields = ('=id', '=user__email', '=status')
+    autocomplete_fields = ('user',)
+    ordering = ('-date_applied', '-id')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
     readonly_fields = ('date_applied', 'date_updated')
+    actions = ('mark_approved', 'mark_rejected', 'mark_flagged', 'mark_pending')
+
+    def _bulk_status(self, request, queryset, target_status):
+        # One UPDATE for the whole selection; disallowed transitions are skipped
+        selected = queryset.count()
+        updated = bulk_update_status(queryset, target_status)
+        self.message_user(request, f"{updated} of {selected} selected loan(s) marked as '{target_status}'.")
+
+    @admin.action(description="Approve selected loans")
+    def mark_approved(self, request, queryset):
+        self._bulk_status(request, queryset, 'approved')
+
+    @admin.action(description="Reject selected loans")
+    def mark_rejected(self, request, queryset):
+        self._bulk_status(request, queryset, 'rejected')
+
+    @admin.action(description="Flag selected loans")
+    def mark_flagged(self, request, queryset):
+        self._bulk_status(request, queryset, 'flagged')
+
+    @admin.action(description="Return selected loans to pending")
+    def mark_pending(self, request, queryset):
+        self._bulk_status(request, queryset, 'pending')
 
 
 @admin.register(FraudFlag)
 class FraudFlagAdmin(ModelAdmin): 
     list_display = ('id', 'loan_application', 'reason')
-    search_fields = ('reason', 'loan_application__user__first_name')
+    # Loan.__str__ shows the applicant's name
+    list_select_related = ('loan_application__user',)
+    search_fields = ('=loan_application__id', '=loan_application__user__email')
+    autocomplete_fields = ('loan_application',)
+    ordering = ('-id',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
+
+
+@admin.register(FraudCheckJob)
+class FraudCheckJobAdmin(ModelAdmin):
+    list_display = ('id', 'loan_application', 'status', 'attempts', 'claimed_at', 'created_at')
+    list_filter = ('status',)
+    readonly_fields = ('created_at', 'claimed_at', 'last_error')
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(ModelAdmin):
+    list_display = ('id', 'subject', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status',)
+    readonly_fields = ('created_at', 'sent_at', 'last_error')
+
+
+@admin.register(LoanDailyStat)
+class LoanDailyStatAdmin(ModelAdmin):
+    list_display = ('day', 'status', 'loan_count', 'total_amount')
+    list_filter = ('status',)
+    date_hierarchy = 'day'
+
+    # Maintained by the loan write paths; rebuild with `manage.py rebuild_loan_stats`
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
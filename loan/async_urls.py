@@ -0,0 +1,10 @@
+from django.urls import path
+from . import async_views
+
+# Served instead of the matching loan/urls.py routes under ASGI; anything
+# not listed here falls through to the DRF views
+urlpatterns = [
+    path('loan-request/<uuid:user_id>/', async_views.loan_request, name='loan_request'),
+    path('retrieve-all-loans/<uuid:user_id>/', async_views.retrieve_all_loans, name='retrieve_all_loans'),
+    path('admin/flagged-loans/', async_views.flagged_loans, name='flagged_loans'),
+]
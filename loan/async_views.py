@@ -0,0 +1,163 @@
+"""
+Native async versions of the hot loan endpoints, routed in place of the DRF
+views for requests arriving through quickcheck/asgi.py (see
+quickcheck.middleware.asgi_urlconf_middleware). Responses match the sync views.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+from account.authentication import CachedJWTAuthentication
+from quickcheck.async_api import error_response, check_method, parse_body
+from quickcheck.metrics import timed_serialization
+from .serializers import LoanRequestSerializer, FastLoanListSerializer, loan_list_rows
+from .pagination import get_loan_paginator
+from .models import LoanApplication
+from .utils import submit_loan
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+
+async def authenticate(request, admin=False):
+    """
+    Async stand-in for IsAuthenticated / IsAdminUser. Returns (user, None),
+    or (None, response) when the request must be refused.
+    """
+    authenticator = CachedJWTAuthentication()
+    try:
+        result = await authenticator.aauthenticate(request)
+    except exceptions.APIException as exc:
+        return None, error_response(exc, authenticator)
+
+    if result is None:
+        return None, error_response(exceptions.NotAuthenticated(), authenticator)
+
+    user = result[0]
+    if admin and not user.is_staff:
+        return None, error_response(exceptions.PermissionDenied())
+    return user, None
+
+
+def submit_in_transaction(user, data, evaluate):
+    with transaction.atomic():
+        return submit_loan(user, data, evaluate=evaluate)
+
+
+@csrf_exempt
+async def loan_request(request, user_id):
+    """
+    Allows an authenticated user to apply for a loan.
+    The velocity bump, the fraud lookups and the insert share one
+    transaction, as in the WSGI view.
+    """
+    user, error = await authenticate(request)
+    if error:
+        return error
+
+    try:
+        check_method(request, 'POST')
+    except exceptions.MethodNotAllowed as exc:
+        return error_response(exc)
+
+    if user.id != user_id:
+        logger.warning("Unauthorized loan attempt by %s on behalf of user ID %s", user.email, user_id)
+        return JsonResponse({"detail": "You can only apply for a loan on your own behalf."},
+                            status=status.HTTP_403_FORBIDDEN)
+
+    try:
+        data = parse_body(request)
+    except exceptions.APIException as exc:
+        return error_response(exc)
+
+    serializer = LoanRequestSerializer(data=data)
+    if not serializer.is_valid():
+        logger.error("Loan submission failed for %s: %s", user.email, serializer.errors)
+        return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    run_inline = settings.LOAN_FRAUD_CHECK_MODE == 'sync'
+    loan, reasons = await sync_to_async(submit_in_transaction)(user, serializer.validated_data, run_inline)
+
+    if not run_inline:
+        logger.info("Loan #%s submitted by %s and queued for fraud review", loan.id, user.email, extra={'loan_id': loan.id})
+        return JsonResponse({
+            "detail": "Loan submitted successfully.",
+            "loan_id": loan.id,
+            "status": loan.status,
+        }, status=status.HTTP_201_CREATED)
+
+    if reasons:
+        logger.warning("Loan #%s by %s flagged for: %s", loan.id, user.email, reasons, extra={'loan_id': loan.id})
+        return JsonResponse({
+            "detail": "Loan submitted and flagged for review.",
+            "reasons": reasons
+        }, status=status.HTTP_201_CREATED)
+
+    logger.info("Loan #%s submitted successfully by %s", loan.id, user.email, extra={'loan_id': loan.id})
+    return JsonResponse({"detail": "Loan submitted successfully."}, status=status.HTTP_201_CREATED)
+
+
+async def retrieve_all_loans(request, user_id):
+    """
+    Retrieves all loan applications submitted by the authenticated user.
+    The total count and the page are read concurrently.
+    """
+    user, error = await authenticate(request)
+    if error:
+        return error
+
+    try:
+        check_method(request, 'GET', 'HEAD')
+    except exceptions.MethodNotAllowed as exc:
+        return error_response(exc)
+
+    if user.id != user_id:
+        logger.warning("Unauthorized loan access attempt by %s for user ID %s", user.email, user_id)
+        return JsonResponse({"detail": "You can only view your own loans."},
+                            status=status.HTTP_403_FORBIDDEN)
+
+    request = Request(request)
+    loans = loan_list_rows(LoanApplication.objects.filter(user=user).order_by('-date_applied', '-id'))
+    paginator = get_loan_paginator(request)
+    try:
+        paginated_loans = await paginator.apaginate_queryset(loans, request)
+    except exceptions.NotFound as exc:
+        return error_response(exc)
+
+    logger.info("%s retrieved their loan history", user.email)
+    with timed_serialization():
+        return JsonResponse(paginator.get_paginated_payload(FastLoanListSerializer(paginated_loans).data))
+
+
+async def flagged_loans(request):
+    """
+    Retrieves all loan applications that have been flagged for fraud review.
+    """
+    user, error = await authenticate(request, admin=True)
+    if error:
+        return error
+
+    try:
+        check_method(request, 'GET', 'HEAD')
+    except exceptions.MethodNotAllowed as exc:
+        return error_response(exc)
+
+    request = Request(request)
+    loans = loan_list_rows(LoanApplication.objects.filter(status='flagged').order_by('-date_applied', '-id'))
+    paginator = get_loan_paginator(request)
+    try:
+        paginated_loans = await paginator.apaginate_queryset(loans, request)
+    except exceptions.NotFound as exc:
+        return error_response(exc)
+
+    if not paginated_loans and paginator.is_first_page():
+        logger.info("Admin requested flagged loans: none found.")
+        return JsonResponse({"detail": "No flagged loan applications at this time."}, status=status.HTTP_200_OK)
+
+    logger.info("Admin %s retrieved %s flagged loan(s).", user.email, len(paginated_loans))
+    with timed_serialization():
+        return JsonResponse(paginator.get_paginated_payload(FastLoanListSerializer(paginated_loans).data))
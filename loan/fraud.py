@@ -0,0 +1,173 @@
+import time
+from django.conf import settings
+from django.utils import timezone
+from account.models import EmailDomainCount
+from quickcheck.metrics import observe_fraud_rule
+from quickcheck.routers import use_primary
+from .velocity import recent_submission_count
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Registered rule classes by name; LOAN_FRAUD_RULES selects which ones run
+RULE_REGISTRY = {}
+
+
+def register_rule(rule_class):
+    """
+    Class decorator adding a FraudRule subclass to the registry.
+    """
+    RULE_REGISTRY[rule_class.name] = rule_class
+    return rule_class
+
+
+# Features rules can depend on, loaded on first use and shared by all rules
+FEATURE_LOADERS = {
+    'email_domain': lambda context: context.user.email_domain,
+    'recent_loans': lambda context: recent_submission_count(context.user, context.now),
+    'domain_count': lambda context: EmailDomainCount.get_user_count(context.user.email_domain),
+}
+
+
+class FraudContext:
+    """
+    The loan being evaluated plus lazily loaded features. Features a caller
+    already knows (e.g. a velocity snapshot, or counts computed for a whole
+    batch) are passed in and never fetched again.
+    """
+
+    def __init__(self, user, amount_requested, now=None, **features):
+        self.user = user
+        self.amount_requested = amount_requested
+        self.now = now or timezone.now()
+        self.features = {name: value for name, value in features.items() if value is not None}
+        self.features['amount_requested'] = amount_requested
+
+    def __getitem__(self, name):
+        if name not in self.features:
+            self.features[name] = FEATURE_LOADERS[name](self)
+        return self.features[name]
+
+
+class FraudRule:
+    """
+    Base class for fraud rules.
+
+    `cost` orders execution (cheap in-memory rules first), `requires` names
+    the features the rule reads, and thresholds come from settings when the
+    rule is instantiated. `fires` receives a mapping of features; written
+    with plain comparisons it also works on NumPy arrays, which is how
+    `manage.py rescore_loans` evaluates a whole chunk at once. `reason`
+    builds the message stored on the FraudFlag.
+    """
+    name = None
+    cost = 0
+    requires = ()
+
+    def fires(self, features):
+        raise NotImplementedError
+
+    def reason(self, features):
+        raise NotImplementedError
+
+    def evaluate(self, context):
+        if self.fires(context):
+            return self.reason(context)
+        return None
+
+
+@register_rule
+class AmountCapRule(FraudRule):
+    name = 'amount_cap'
+    cost = 0
+    requires = ('amount_requested',)
+
+    def __init__(self):
+        self.limit = settings.LOAN_FRAUD_AMOUNT_CAP
+
+    def fires(self, features):
+        return features['amount_requested'] > self.limit
+
+    def reason(self, features):
+        return f"Requested amount exceeds ₦{self.limit:,}."
+
+
+@register_rule
+class VelocityRule(FraudRule):
+    name = 'velocity'
+    cost = 10
+    requires = ('recent_loans',)
+
+    def __init__(self):
+        self.limit = settings.LOAN_FRAUD_VELOCITY_LIMIT
+
+    def fires(self, features):
+        return features['recent_loans'] >= self.limit
+
+    def reason(self, features):
+        return f"More than {self.limit} loans submitted in the last 24 hours."
+
+
+@register_rule
+class SharedEmailDomainRule(FraudRule):
+    name = 'shared_email_domain'
+    cost = 10
+    requires = ('domain_count',)
+
+    def __init__(self):
+        self.limit = settings.LOAN_FRAUD_DOMAIN_LIMIT
+
+    def fires(self, features):
+        return features['domain_count'] > self.limit
+
+    def reason(self, features):
+        return f"Email domain '{features['email_domain']}' is used by more than {self.limit} users."
+
+
+class FraudEvaluation:
+    """
+    Outcome of a FraudEngine run: the reasons found and per-rule timings (seconds).
+    """
+
+    def __init__(self):
+        self.reasons = []
+        self.fired = []
+        self.timings = {}
+
+    @property
+    def flagged(self):
+        return bool(self.reasons)
+
+
+class FraudEngine:
+    """
+    Runs the enabled rules in cost order. With `short_circuit` the run stops
+    at the first rule that fires, so expensive rules are skipped once the
+    outcome is known.
+    """
+
+    def __init__(self, rule_names=None, short_circuit=None):
+        rule_names = settings.LOAN_FRAUD_RULES if rule_names is None else rule_names
+        self.rules = sorted((RULE_REGISTRY[name]() for name in rule_names), key=lambda rule: rule.cost)
+        self.short_circuit = settings.LOAN_FRAUD_SHORT_CIRCUIT if short_circuit is None else short_circuit
+
+    def evaluate(self, context):
+        evaluation = FraudEvaluation()
+
+        for rule in self.rules:
+            started = time.perf_counter()
+            # Feature lookups must see the latest writes, never a lagging replica
+            with use_primary():
+                reason = rule.evaluate(context)
+            evaluation.timings[rule.name] = time.perf_counter() - started
+            observe_fraud_rule(rule.name, evaluation.timings[rule.name])
+
+            if reason:
+                evaluation.reasons.append(reason)
+                evaluation.fired.append(rule.name)
+                logger.warning("Fraud alert for user %s: %s", context.user.email, reason)
+                if self.short_circuit:
+                    break
+
+        return evaluation
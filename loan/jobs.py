@@ -0,0 +1,90 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from .models import LoanApplication, FraudCheckJob
+from .utils import evaluate_loan
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def claim_fraud_jobs(batch_size):
+    """
+    Marks up to `batch_size` queued jobs as running and returns them.
+    Jobs left running longer than LOAN_FRAUD_JOB_LEASE (a crashed worker)
+    are claimed again.
+    """
+    now = timezone.now()
+    claimable = Q(status='queued') | Q(
+        status='running',
+        claimed_at__lt=now - timedelta(seconds=settings.LOAN_FRAUD_JOB_LEASE),
+    )
+
+    with transaction.atomic():
+        ids = list(
+            FraudCheckJob.objects.select_for_update(skip_locked=True)
+            .filter(claimable)
+            .order_by('id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return []
+
+        FraudCheckJob.objects.filter(claimable, id__in=ids).update(
+            status='running',
+            claimed_at=now,
+            attempts=F('attempts') + 1,
+        )
+
+    return list(FraudCheckJob.objects.filter(id__in=ids, status='running', claimed_at=now))
+
+
+def run_fraud_job(job):
+    """
+    Evaluates the job's loan. Loans that left 'pending' before the worker got
+    to them (e.g. approved by an admin) are left alone, since approved and
+    rejected are final. Failed jobs are re-queued until
+    LOAN_FRAUD_JOB_MAX_ATTEMPTS is reached.
+    """
+    try:
+        with transaction.atomic():
+            # Re-read under the job's transaction so an admin decision made
+            # after the claim is seen before anything is written
+            loan = (
+                LoanApplication.objects.select_for_update()
+                .select_related('user')
+                .get(pk=job.loan_application_id)
+            )
+            if loan.status == 'pending':
+                reasons = evaluate_loan(loan, recent_loans=job.recent_loans)
+            else:
+                logger.info(
+                    "Loan #%s is already '%s'; fraud check skipped", loan.id, loan.status,
+                    extra={'loan_id': loan.id},
+                )
+                reasons = []
+            job.status = 'done'
+            job.save(update_fields=['status'])
+    except Exception as exc:
+        logger.exception(
+            "Fraud check job #%s for Loan #%s failed", job.id, job.loan_application_id,
+            extra={'loan_id': job.loan_application_id},
+        )
+        job.status = 'failed' if job.attempts >= settings.LOAN_FRAUD_JOB_MAX_ATTEMPTS else 'queued'
+        job.last_error = str(exc)
+        job.save(update_fields=['status', 'last_error'])
+        return None
+
+    return reasons
+
+
+def process_fraud_jobs(batch_size=None):
+    """
+    Claims and runs one batch of jobs. Returns the number of jobs processed.
+    """
+    jobs = claim_fraud_jobs(batch_size or settings.LOAN_FRAUD_JOB_BATCH_SIZE)
+    for job in jobs:
+        run_fraud_job(job)
+    return len(jobs)
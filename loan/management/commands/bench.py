@@ -0,0 +1,291 @@
+import io
+import json
+import random
+import statistics
+import threading
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from account.models import User
+from loan.models import LoanApplication
+
+
+PASSWORD = 'Benchseries1@'
+
+# Seeded status mix (weights), roughly what a live queue looks like
+STATUS_MIX = {'pending': 60, 'flagged': 15, 'approved': 20, 'rejected': 5}
+
+SCENARIOS = (
+    'registration', 'login', 'token_refresh', 'loan_request',
+    'retrieve_all_loans', 'flagged_loans', 'update_loan_status',
+)
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a throwaway test database and drives the API through the test client, "
+        "sequentially and from several threads. Prints throughput, p50/p95/p99 latency "
+        "and queries per request as JSON, optionally compared with a stored baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200, help="Seeded users.")
+        parser.add_argument('--domains', type=int, default=20, help="Email domains the users are spread across.")
+        parser.add_argument('--loans', type=int, default=2000, help="Seeded loan applications.")
+        parser.add_argument('--requests', type=int, default=50, help="Requests per scenario and mode.")
+        parser.add_argument('--threads', type=int, default=4, help="Threads in the concurrent mode.")
+        parser.add_argument('--scenario', action='append', choices=SCENARIOS, help="Run only these scenarios (repeatable).")
+        parser.add_argument('--seed', type=int, default=1, help="Random seed for the dataset.")
+        parser.add_argument('--output', help="Also write the JSON report to this file (e.g. to keep as a baseline).")
+        parser.add_argument('--baseline', help="JSON report of an earlier run to compare against.")
+        parser.add_argument(
+            '--max-regression', type=float,
+            help="Fail when a p95 latency grows by more than this fraction over the baseline (e.g. 0.2).",
+        )
+        parser.add_argument(
+            '--current-db', action='store_true',
+            help="Use the current database instead of creating a test database (it must be disposable).",
+        )
+
+    def handle(self, *args, **options):
+        baseline = self.load_baseline(options['baseline'])
+
+        old_config = None
+        if not options['current_db']:
+            setup_test_environment()
+            old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            self.seed(options)
+            report = self.run(options)
+        finally:
+            if old_config is not None:
+                teardown_databases(old_config, verbosity=0)
+                teardown_test_environment()
+
+        if baseline is not None:
+            report['comparison'] = self.compare(report, baseline)
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                handle.write(output + '\n')
+        self.stdout.write(output)
+
+        if baseline is not None and options['max_regression'] is not None:
+            regressions = [
+                f"{name} ({mode}): p95 {change:+.0%}"
+                for name, modes in report['comparison'].items()
+                for mode, delta in modes.items()
+                if (change := delta['p95_ms_change']) is not None and change > options['max_regression']
+            ]
+            if regressions:
+                raise CommandError("Latency regressed: " + ", ".join(regressions))
+
+    def load_baseline(self, path):
+        if not path:
+            return None
+        try:
+            with open(path) as handle:
+                return json.load(handle)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Cannot read baseline {path}: {exc}")
+
+    def seed(self, options):
+        rng = random.Random(options['seed'])
+        now = timezone.now()
+        password = make_password(PASSWORD)
+
+        users = User.objects.bulk_create([
+            User(
+                email=f"bench{number}@domain{number % options['domains']}.example",
+                email_domain=f"domain{number % options['domains']}.example",
+                first_name='Bench', last_name=str(number), password=password,
+            )
+            for number in range(options['users'])
+        ], batch_size=1000)
+        self.admin = User.objects.create_superuser(
+            email='bench-admin@quickcheck.example', first_name='Bench', last_name='Admin', password=PASSWORD
+        )
+
+        statuses, weights = zip(*STATUS_MIX.items())
+        loans = LoanApplication.objects.bulk_create([
+            LoanApplication(
+                user=rng.choice(users),
+                amount_requested=Decimal(rng.randrange(10_000, 2_000_000, 500)),
+                purpose='Working capital',
+                status=rng.choices(statuses, weights)[0],
+            )
+            for _ in range(options['loans'])
+        ], batch_size=1000)
+        # Spread over the last 60 days (date_applied is auto_now_add, so set it afterwards)
+        for loan in loans:
+            loan.date_applied = now - timedelta(minutes=rng.randrange(60 * 24 * 60))
+        LoanApplication.objects.bulk_update(loans, ['date_applied'], batch_size=1000)
+
+        # Counters maintained on the regular write paths, bypassed by bulk writes
+        call_command('rebuild_domain_counts', stdout=io.StringIO())
+        call_command('rebuild_loan_stats', stdout=io.StringIO())
+
+        self.users = users
+        self.open_loans = list(
+            LoanApplication.objects.filter(status__in=['pending', 'flagged']).values_list('id', flat=True)
+        )
+        rng.shuffle(self.open_loans)
+
+    def run(self, options):
+        scenarios = options['scenario'] or SCENARIOS
+        total = options['requests']
+        results = {}
+        for name in scenarios:
+            results[name] = {}
+            for mode, threads in (('sequential', 1), ('concurrent', options['threads'])):
+                requests = [self.build_request(name, mode, number) for number in range(total)]
+                results[name][mode] = self.drive(requests, threads)
+
+        return {
+            'dataset': {key: options[key] for key in ('users', 'domains', 'loans', 'seed')},
+            'requests': total,
+            'threads': options['threads'],
+            'results': results,
+        }
+
+    def build_request(self, name, mode, number):
+        """
+        Everything one request needs, prepared before the clock starts:
+        (method, path, payload, Authorization header, expected status).
+        """
+        user = self.users[number % len(self.users)]
+        bearer = f"Bearer {AccessToken.for_user(user)}"
+
+        if name == 'registration':
+            payload = {
+                'email': f"new-{mode}-{number}@signup.example", 'first_name': 'New', 'last_name': 'User',
+                'password': PASSWORD, 'password2': PASSWORD,
+            }
+            return 'post', '/account/registration/', payload, None, 201
+        if name == 'login':
+            return 'post', '/account/login/', {'email': user.email, 'password': PASSWORD}, None, 200
+        if name == 'token_refresh':
+            return 'post', '/account/token/refresh/', {'refresh': str(RefreshToken.for_user(user))}, None, 200
+        if name == 'loan_request':
+            payload = {'amount_requested': '50000.00', 'purpose': 'Stock'}
+            return 'post', f"/loan/loan-request/{user.id}/", payload, bearer, 201
+        if name == 'retrieve_all_loans':
+            return 'get', f"/loan/retrieve-all-loans/{user.id}/", None, bearer, 200
+
+        admin_bearer = f"Bearer {AccessToken.for_user(self.admin)}"
+        if name == 'flagged_loans':
+            return 'get', '/loan/admin/flagged-loans/', None, admin_bearer, 200
+        if not self.open_loans:
+            raise CommandError("Not enough open loans for update_loan_status; seed more with --loans.")
+        loan_id = self.open_loans.pop()
+        return 'patch', f"/loan/admin/loan/{loan_id}/", {'status': 'approved'}, admin_bearer, 200
+
+    def drive(self, requests, threads):
+        latencies = []
+        queries = []
+        errors = []
+        lock = threading.Lock()
+        batches = [requests[index::threads] for index in range(threads)]
+
+        def thread_worker(batch):
+            try:
+                worker(batch)
+            finally:
+                connection.close()
+
+        def worker(batch):
+            client = Client()
+            counter = QueryCounter()
+            local = []
+            with connection.execute_wrapper(counter):
+                for method, path, payload, bearer, expected in batch:
+                    headers = {'HTTP_AUTHORIZATION': bearer} if bearer else {}
+                    before = counter.count
+                    started = time.perf_counter()
+                    if payload is None:
+                        response = getattr(client, method)(path, **headers)
+                    else:
+                        response = getattr(client, method)(
+                            path, data=json.dumps(payload), content_type='application/json', **headers
+                        )
+                    local.append((time.perf_counter() - started, counter.count - before, response.status_code, expected))
+            with lock:
+                for seconds, count, status_code, expected in local:
+                    latencies.append(seconds)
+                    queries.append(count)
+                    if status_code != expected:
+                        errors.append(status_code)
+
+        started = time.perf_counter()
+        if threads == 1:
+            worker(requests)
+        else:
+            workers = [threading.Thread(target=thread_worker, args=(batch,)) for batch in batches]
+            for thread in workers:
+                thread.start()
+            for thread in workers:
+                thread.join()
+        elapsed = time.perf_counter() - started
+
+        return summarize(latencies, queries, errors, elapsed)
+
+    def compare(self, report, baseline):
+        comparison = {}
+        for name, modes in report['results'].items():
+            for mode, current in modes.items():
+                previous = baseline.get('results', {}).get(name, {}).get(mode)
+                if not previous:
+                    continue
+                comparison.setdefault(name, {})[mode] = {
+                    'throughput_change': change(current['throughput'], previous['throughput']),
+                    'p95_ms_change': change(current['p95_ms'], previous['p95_ms']),
+                    'queries_per_request_change': round(
+                        current['queries_per_request'] - previous['queries_per_request'], 2
+                    ),
+                }
+        return comparison
+
+
+def summarize(latencies, queries, errors, elapsed):
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = latencies[0] if latencies else 0.0
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'error_statuses': sorted(set(errors)),
+        'seconds': round(elapsed, 3),
+        'throughput': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(p50 * 1000, 2),
+        'p95_ms': round(p95 * 1000, 2),
+        'p99_ms': round(p99 * 1000, 2),
+        'queries_per_request': round(sum(queries) / len(queries), 2) if queries else 0.0,
+    }
+
+
+def change(current, previous):
+    if not previous:
+        return None
+    return round((current - previous) / previous, 3)
@@ -0,0 +1,31 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from loan.jobs import process_fraud_jobs
+
+
+class Command(BaseCommand):
+    help = "Runs queued fraud checks for submitted loans."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.LOAN_FRAUD_JOB_BATCH_SIZE,
+                            help="Number of jobs claimed per batch.")
+        parser.add_argument('--sleep', type=float, default=1.0,
+                            help="Seconds to wait when the queue is empty.")
+        parser.add_argument('--once', action='store_true',
+                            help="Drain the queue and exit instead of polling.")
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            processed = process_fraud_jobs(options['batch_size'])
+            total += processed
+
+            if processed:
+                continue
+            if options['once']:
+                break
+            time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {total} fraud check job(s)."))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+from loan.models import LoanApplication, LoanDailyStat
+
+
+class Command(BaseCommand):
+    help = "Recomputes the LoanDailyStat rollup from the loan applications."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            LoanDailyStat.objects.all().delete()
+            rows = (
+                LoanApplication.objects.annotate(day=TruncDate('date_applied'))
+                .values('day', 'status')
+                .annotate(loans=Count('id'), amount=Sum('amount_requested'))
+                .order_by()
+            )
+            stats = LoanDailyStat.objects.bulk_create(
+                [
+                    LoanDailyStat(day=row['day'], status=row['status'], loan_count=row['loans'], total_amount=row['amount'])
+                    for row in rows
+                ],
+                batch_size=1000,
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt loan statistics: {len(stats)} day/status row(s)."))
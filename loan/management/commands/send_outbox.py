@@ -0,0 +1,50 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from loan.notifications import flush_fraud_alerts, send_outbox
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Queues due fraud alert digests and delivers outbox emails over a reused mail connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.LOAN_OUTBOX_BATCH_SIZE,
+                            help="Number of emails sent per connection.")
+        parser.add_argument('--sleep', type=float, default=5.0,
+                            help="Seconds to wait when nothing is due.")
+        parser.add_argument('--once', action='store_true',
+                            help="Send everything currently due and exit instead of polling.")
+        parser.add_argument('--flush', action='store_true',
+                            help="Send buffered fraud alerts now instead of waiting for the digest window.")
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        while True:
+            try:
+                while flush_fraud_alerts(force=options['flush']):
+                    pass
+                sent, failed = send_outbox(options['batch_size'])
+            except Exception:
+                # Typically the mail server refusing the connection; the
+                # claimed batch becomes due again once its lease expires
+                logger.exception("Outbox delivery batch failed")
+                sent = failed = 0
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+                continue
+
+            total_sent += sent
+            total_failed += failed
+
+            if sent or failed:
+                continue
+            if options['once']:
+                break
+            time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS(f"Sent {total_sent} email(s); {total_failed} attempt(s) failed."))
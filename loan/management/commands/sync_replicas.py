@@ -0,0 +1,39 @@
+import sqlite3
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+SQLITE_ENGINE = 'django.db.backends.sqlite3'
+
+
+class Command(BaseCommand):
+    help = (
+        "Copies the primary SQLite database into every DATABASE_REPLICAS file with the "
+        "SQLite backup API. For trying replica routing locally; real replicas replicate themselves."
+    )
+
+    def handle(self, *args, **options):
+        if not settings.DATABASE_REPLICAS:
+            self.stdout.write("No replicas configured; set DATABASE_REPLICAS.")
+            return
+
+        primary = settings.DATABASES['default']
+        if primary['ENGINE'] != SQLITE_ENGINE:
+            raise CommandError("sync_replicas only supports SQLite databases.")
+
+        source = sqlite3.connect(primary['NAME'])
+        try:
+            for alias in settings.DATABASE_REPLICAS:
+                replica = settings.DATABASES[alias]
+                if replica['ENGINE'] != SQLITE_ENGINE:
+                    raise CommandError(f"Replica '{alias}' is not an SQLite database.")
+
+                # The backup API takes SQLite's locks, so open connections to the replica are safe
+                target = sqlite3.connect(replica['NAME'])
+                try:
+                    source.backup(target)
+                finally:
+                    target.close()
+                self.stdout.write(self.style.SUCCESS(f"Copied {primary['NAME']} to {alias} ({replica['NAME']})."))
+        finally:
+            source.close()
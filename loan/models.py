@@ -1,8 +1,23 @@
-from django.db import models
+from django.db import connections, models, router, transaction
+from django.db.models import Q
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+# Loans still waiting on a decision (the admin work queues)
+OPEN_STATUSES = ('pending', 'flagged')
+
+
+class LoanApplicationQuerySet(models.QuerySet):
+
+    def open(self):
+        """
+        Pending and flagged loans: the admin work queues.
+        """
+        return self.filter(status__in=OPEN_STATUSES)
+
+
 class LoanApplication(models.Model):
     """
     Represents a loan application made by a user.
@@ -15,6 +30,17 @@ class LoanApplication(models.Model):
         ('flagged', 'Flagged'),
     )
 
+    OPEN_STATUSES = OPEN_STATUSES
+
+    # Status changes admins may apply in bulk: target -> allowed current statuses.
+    # Approved and rejected loans are final.
+    ALLOWED_TRANSITIONS = {
+        'pending': ('flagged',),
+        'approved': ('pending', 'flagged'),
+        'rejected': ('pending', 'flagged'),
+        'flagged': ('pending',),
+    }
+
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='loan_applications')
     amount_requested = models.DecimalField(max_digits=15, decimal_places=2)
     purpose = models.CharField(max_length=100)
@@ -22,13 +48,70 @@ class LoanApplication(models.Model):
     date_applied = models.DateTimeField(auto_now_add=True)
     date_updated = models.DateTimeField(auto_now=True)
 
+    objects = LoanApplicationQuerySet.as_manager()
+
+    # Fields making up stats_key
+    STATS_FIELDS = ('date_applied', 'status', 'amount_requested')
+
+    # (day, status, amount) as loaded from the database, for LoanDailyStat upkeep
+    _loaded_stats_key = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if set(cls.STATS_FIELDS) <= set(field_names):
+            instance._loaded_stats_key = instance.stats_key
+        return instance
+
+    @property
+    def stats_key(self):
+        return (timezone.localdate(self.date_applied), self.status, self.amount_requested)
+
+    def save(self, *args, **kwargs):
+        # LoanDailyStat is updated from post_save, keep both writes together
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            if not self._state.adding and self._loaded_stats_key is None:
+                self.load_stats_key(using)
+            super().save(*args, **kwargs)
+
+    def load_stats_key(self, using):
+        """
+        Reads the stored stats_key of an instance loaded without all of
+        STATS_FIELDS (.only()/.defer()), filling in the deferred ones, so
+        the rollup sees the change it is about to save.
+        """
+        stored = type(self)._base_manager.using(using).filter(pk=self.pk).values_list(*self.STATS_FIELDS).first()
+        if stored is None:
+            return
+        deferred = self.get_deferred_fields()
+        for field, value in zip(self.STATS_FIELDS, stored):
+            if field in deferred:
+                setattr(self, field, value)
+        date_applied, status, amount = stored
+        self._loaded_stats_key = (timezone.localdate(date_applied), status, amount)
+
     def __str__(self):
         return f"Loan {self.amount_requested} by {self.user.get_full_name()} - {self.status}"
 
     class Meta:
         ordering = ['-date_applied']
         indexes = [
-            models.Index(fields=['user']),
+            # Velocity window, per-user history and its (date_applied, id) keyset
+            models.Index(fields=['user', 'date_applied', 'id']),
+            # Keyset pages of the flagged queue; admin status + date filters
+            models.Index(fields=['status', 'date_applied', 'id']),
+            # Admin date filters without a status, in changelist order
+            models.Index(fields=['date_applied', 'id']),
+            # Open work queue (OPEN_STATUSES). SQLite only matches the condition
+            # against literal statuses, so the rescore walk (rescore_loans.open_loans)
+            # uses it there; objects.open() binds them and falls back to the
+            # indexes above
+            models.Index(
+                fields=['date_applied', 'id'],
+                condition=Q(status__in=OPEN_STATUSES),
+                name='loan_open_queue_idx',
+            ),
         ]
 
 
@@ -41,3 +124,168 @@ class FraudFlag(models.Model):
 
     def __str__(self):
         return f"FraudFlag for Loan #{self.loan_application.id} - Reason: {self.reason[:30]}"
+
+
+
+class LoanVelocityBucket(models.Model):
+    """
+    Number of loan applications a user submitted within one clock hour.
+    Summing a user's recent buckets gives the submission velocity without
+    counting LoanApplication rows.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='loan_velocity_buckets')
+    hour = models.DateTimeField()
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id} @ {self.hour:%Y-%m-%d %H:00} - {self.count}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'hour'], name='unique_loan_velocity_bucket'),
+        ]
+
+
+
+class FraudCheckJob(models.Model):
+    """
+    Queued fraud evaluation for a submitted loan, processed by `manage.py fraud_worker`.
+    """
+
+    STATUS_CHOICES = (
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    )
+
+    loan_application = models.ForeignKey(LoanApplication, on_delete=models.CASCADE, related_name='fraud_jobs')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    # Velocity observed when the loan was submitted, so a lagging worker
+    # judges the loan against the same 24h window the client saw
+    recent_loans = models.PositiveIntegerField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"FraudCheckJob #{self.id} for Loan #{self.loan_application_id} - {self.status}"
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'id']),
+        ]
+
+
+
+class OutboundEmail(models.Model):
+    """
+    Email waiting to be delivered by `manage.py send_outbox`.
+    Rows are written in the same transaction as the change they report.
+    """
+
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    )
+
+    subject = models.CharField(max_length=255)
+    text_body = models.TextField()
+    html_body = models.TextField(blank=True)
+    recipients = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.subject} - {self.status}"
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+
+
+class PendingFraudAlert(models.Model):
+    """
+    Flagged loan waiting to be reported to admins. Alerts are buffered here
+    so several flags, or several loans, can share one email.
+    """
+    loan_application = models.OneToOneField(LoanApplication, on_delete=models.CASCADE, related_name='pending_alert')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Pending alert for Loan #{self.loan_application_id}"
+
+    class Meta:
+        ordering = ['id']
+
+
+class LoanDailyStat(models.Model):
+    """
+    Rollup of loan applications per day applied and current status: how many
+    and the total amount requested. Kept in step by every write that creates
+    loans or changes their status, so dashboards read a few hundred rows
+    instead of aggregating LoanApplication. `manage.py rebuild_loan_stats`
+    recomputes it from scratch.
+    """
+    day = models.DateField()
+    status = models.CharField(max_length=10, choices=LoanApplication.STATUS_CHOICES)
+    loan_count = models.IntegerField(default=0)
+    total_amount = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+
+    def __str__(self):
+        return f"{self.day} {self.status}: {self.loan_count} loan(s), {self.total_amount}"
+
+    class Meta:
+        ordering = ['-day', 'status']
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'status'], name='unique_loan_daily_stat'),
+        ]
+
+    @classmethod
+    def apply(cls, deltas):
+        """
+        Adds ``{(day, status): (loans, amount)}`` deltas to the rollup with one
+        INSERT ... ON CONFLICT DO UPDATE per 500 keys (SQLite 3.24+, PostgreSQL).
+        Call it inside the transaction that changes the loans.
+        """
+        rows = [
+            (day, status, loans, amount)
+            for (day, status), (loans, amount) in deltas.items()
+            if loans or amount
+        ]
+        if not rows:
+            return
+
+        connection = connections[router.db_for_write(cls)]
+        table = connection.ops.quote_name(cls._meta.db_table)
+        amount_field = cls._meta.get_field('total_amount')
+
+        with connection.cursor() as cursor:
+            for start in range(0, len(rows), 500):
+                chunk = rows[start:start + 500]
+                params = []
+                for day, status, loans, amount in chunk:
+                    params += [
+                        connection.ops.adapt_datefield_value(day),
+                        status,
+                        loans,
+                        connection.ops.adapt_decimalfield_value(amount, amount_field.max_digits, amount_field.decimal_places),
+                    ]
+                cursor.execute(
+                    f"INSERT INTO {table} (day, status, loan_count, total_amount) "
+                    f"VALUES {', '.join(['(%s, %s, %s, %s)'] * len(chunk))} "
+                    f"ON CONFLICT (day, status) DO UPDATE SET "
+                    f"loan_count = {table}.loan_count + excluded.loan_count, "
+                    f"total_amount = {table}.total_amount + excluded.total_amount",
+                    params,
+                )
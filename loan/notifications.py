@@ -0,0 +1,201 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.contrib.auth import get_user_model
+from django.template.loader import render_to_string
+from django.utils import timezone
+from .models import LoanApplication, OutboundEmail, PendingFraudAlert
+import logging
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+ALERT_RECIPIENTS_CACHE_KEY = 'loan:alert_recipients'
+
+
+def get_alert_recipients():
+    """
+    Returns the email addresses of all superusers, cached for LOAN_ALERT_RECIPIENTS_TTL seconds.
+    """
+    recipients = cache.get(ALERT_RECIPIENTS_CACHE_KEY)
+    if recipients is None:
+        recipients = list(
+            User.objects.filter(is_superuser=True).exclude(email='').values_list('email', flat=True)
+        )
+        cache.set(ALERT_RECIPIENTS_CACHE_KEY, recipients, settings.LOAN_ALERT_RECIPIENTS_TTL)
+    return recipients
+
+
+def invalidate_alert_recipients():
+    cache.delete(ALERT_RECIPIENTS_CACHE_KEY)
+
+
+def queue_email(subject, text_body, html_body, recipients):
+    """
+    Stores an email in the outbox. Delivery happens in `manage.py send_outbox`.
+    """
+    return OutboundEmail.objects.create(
+        subject=subject,
+        text_body=text_body,
+        html_body=html_body,
+        recipients=list(recipients),
+    )
+
+
+def queue_fraud_alert(loan_id):
+    """
+    Records that a loan needs to be reported. Repeated calls for the same
+    loan (one per FraudFlag) collapse into a single pending alert.
+    """
+    queue_fraud_alerts([loan_id])
+
+
+def queue_fraud_alerts(loan_ids):
+    """
+    Records pending alerts for several loans with a single insert.
+    """
+    PendingFraudAlert.objects.bulk_create(
+        [PendingFraudAlert(loan_application_id=loan_id) for loan_id in loan_ids],
+        ignore_conflicts=True,
+    )
+
+
+def _alert_context(loan):
+    return {
+        'loan': loan,
+        'user_full_name': loan.user.get_full_name(),
+        'user_email': loan.user.email,
+        'reasons': [flag.reason for flag in loan.fraud_flags.all()],
+    }
+
+
+def flush_fraud_alerts(force=False):
+    """
+    Turns buffered fraud alerts into outbox emails and returns how many
+    alerts were flushed.
+
+    With LOAN_ALERT_DIGEST_WINDOW set, alerts are held until the oldest one
+    has waited that many seconds or LOAN_ALERT_DIGEST_MAX_LOANS loans are
+    waiting, then sent as one digest. A window of 0 sends one email per loan.
+    """
+    window = settings.LOAN_ALERT_DIGEST_WINDOW
+    max_loans = settings.LOAN_ALERT_DIGEST_MAX_LOANS
+
+    with transaction.atomic():
+        alerts = list(
+            PendingFraudAlert.objects.select_for_update(skip_locked=True)
+            .order_by('id')[:max_loans]
+        )
+        if not alerts:
+            return 0
+
+        window_open = alerts[0].created_at > timezone.now() - timedelta(seconds=window)
+        if window and window_open and len(alerts) < max_loans and not force:
+            return 0
+
+        loans = (
+            LoanApplication.objects
+            .filter(id__in=[alert.loan_application_id for alert in alerts])
+            .select_related('user')
+            .prefetch_related('fraud_flags')
+            .order_by('id')
+        )
+        contexts = [_alert_context(loan) for loan in loans]
+        recipients = get_alert_recipients()
+
+        if recipients and window:
+            context = {'alerts': contexts}
+            queue_email(
+                f"{len(contexts)} loan(s) flagged for fraud",
+                render_to_string('emails/flagged_loans_digest.txt', context),
+                render_to_string('emails/flagged_loans_digest.html', context),
+                recipients,
+            )
+        elif recipients:
+            for context in contexts:
+                queue_email(
+                    f"Loan #{context['loan'].id} flagged for fraud",
+                    render_to_string('emails/flagged_loan_alert.txt', context),
+                    render_to_string('emails/flagged_loan_alert.html', context),
+                    recipients,
+                )
+
+        PendingFraudAlert.objects.filter(id__in=[alert.id for alert in alerts]).delete()
+
+    return len(alerts)
+
+
+def _claim_outbox_batch(batch_size):
+    """
+    Leases up to `batch_size` due emails by pushing their next attempt past
+    LOAN_OUTBOX_LEASE, so concurrent senders skip them and a crashed sender's
+    batch becomes due again on its own.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True)
+            .filter(status='pending', next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        OutboundEmail.objects.filter(id__in=ids).update(
+            next_attempt_at=now + timedelta(seconds=settings.LOAN_OUTBOX_LEASE)
+        )
+    return list(OutboundEmail.objects.filter(id__in=ids).order_by('id'))
+
+
+def _retry_delay(attempts):
+    return timedelta(seconds=settings.LOAN_OUTBOX_RETRY_BACKOFF * 2 ** (attempts - 1))
+
+
+def send_outbox(batch_size=None):
+    """
+    Delivers one batch of due outbox emails over a single backend connection.
+    Returns a (sent, failed) tuple; failures are rescheduled with exponential
+    backoff until LOAN_OUTBOX_MAX_ATTEMPTS is reached.
+    """
+    messages = _claim_outbox_batch(batch_size or settings.LOAN_OUTBOX_BATCH_SIZE)
+    if not messages:
+        return 0, 0
+
+    sent = failed = 0
+    connection = get_connection()
+    try:
+        connection.open()
+        for message in messages:
+            email = EmailMultiAlternatives(
+                subject=message.subject,
+                body=message.text_body,
+                from_email=settings.DEFAULT_FROM_EMAIL,
+                to=message.recipients,
+                connection=connection,
+            )
+            if message.html_body:
+                email.attach_alternative(message.html_body, "text/html")
+
+            message.attempts += 1
+            try:
+                email.send()
+            except Exception as exc:
+                logger.warning("Outbox email #%s failed (attempt %s): %s", message.id, message.attempts, exc)
+                failed += 1
+                message.last_error = str(exc)
+                if message.attempts >= settings.LOAN_OUTBOX_MAX_ATTEMPTS:
+                    message.status = 'failed'
+                else:
+                    message.next_attempt_at = timezone.now() + _retry_delay(message.attempts)
+            else:
+                sent += 1
+                message.status = 'sent'
+                message.sent_at = timezone.now()
+    finally:
+        connection.close()
+        OutboundEmail.objects.bulk_update(
+            messages, ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at']
+        )
+
+    return sent, failed
@@ -0,0 +1,160 @@
+import asyncio
+import base64
+import json
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination that seeks on (date_applied, id), newest first.
+
+    Every page is one indexed range read of `limit + 1` rows, so deep pages
+    cost the same as the first one. The opaque `next` cursor encodes the last
+    row's position. `include_total=false` also skips the COUNT(*).
+    """
+    page_size = api_settings.PAGE_SIZE
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    limit_query_param = 'limit'
+    include_total_query_param = 'include_total'
+    ordering = ('-date_applied', '-id')
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.count = queryset.count() if self.include_total(request) else None
+        return self.set_page(list(self.page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async paginate_queryset; the COUNT(*) and the page read run concurrently.
+        """
+        self.request = request
+        self.limit = self.get_limit(request)
+        page = self.page_queryset(queryset, request)
+        if self.include_total(request):
+            self.count, rows = await asyncio.gather(queryset.acount(), fetch_all(page))
+        else:
+            self.count, rows = None, await fetch_all(page)
+        return self.set_page(rows)
+
+    def page_queryset(self, queryset, request):
+        position = self.decode_cursor(request)
+        if position is not None:
+            date_applied, pk = position
+            queryset = queryset.filter(
+                Q(date_applied__lt=date_applied) | Q(date_applied=date_applied, id__lt=pk)
+            )
+        return queryset.order_by(*self.ordering)[:self.limit + 1]
+
+    def set_page(self, rows):
+        self.has_next = len(rows) > self.limit
+        self.page = rows[:self.limit]
+        return self.page
+
+    def is_first_page(self):
+        return self.decode_cursor(self.request) is None
+
+    def get_limit(self, request):
+        try:
+            return _positive_int(request.query_params[self.limit_query_param], strict=True, cutoff=self.max_page_size)
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def include_total(self, request):
+        return request.query_params.get(self.include_total_query_param, 'true').lower() != 'false'
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            date_applied, pk = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            date_applied = parse_datetime(date_applied)
+            pk = int(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if date_applied is None:
+            raise NotFound(self.invalid_cursor_message)
+        return date_applied, pk
+
+    def encode_cursor(self, row):
+        # Rows are model instances or values() dicts
+        if isinstance(row, dict):
+            date_applied, pk = row['date_applied'], row['id']
+        else:
+            date_applied, pk = row.date_applied, row.id
+        position = json.dumps([date_applied.isoformat(), pk])
+        return base64.urlsafe_b64encode(position.encode('ascii')).decode('ascii')
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_payload(self, data):
+        payload = {}
+        if self.count is not None:
+            payload['count'] = self.count
+        payload['next'] = self.get_next_link()
+        payload['results'] = data
+        return payload
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_payload(data))
+
+
+class LoanLimitOffsetPagination(LimitOffsetPagination):
+    """
+    DRF limit/offset pagination with an async variant for the ASGI loan views.
+    """
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.offset = self.get_offset(request)
+        self.count, page = await asyncio.gather(
+            queryset.acount(), fetch_all(queryset[self.offset:self.offset + self.limit])
+        )
+        if self.count > self.limit and self.template is not None:
+            self.display_page_controls = True
+        return page
+
+    def is_first_page(self):
+        return self.offset == 0
+
+    def get_paginated_payload(self, data):
+        return {
+            'count': self.count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+
+
+async def fetch_all(queryset):
+    return [row async for row in queryset]
+
+
+def get_loan_paginator(request):
+    """
+    Returns the paginator requested by the client: keyset pagination when a
+    `cursor` is passed or `pagination=cursor` is asked for, otherwise the
+    default limit/offset pagination.
+    """
+    if request.query_params.get('pagination') == 'cursor' or KeysetPagination.cursor_query_param in request.query_params:
+        return KeysetPagination()
+    return LoanLimitOffsetPagination()
@@ -1,5 +1,10 @@
+from decimal import Decimal
+from django.conf import settings
 from rest_framework import serializers
+from django.db import transaction
+from django.utils import timezone
 from .models import LoanApplication, FraudFlag
+from .utils import submit_loan
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -58,22 +63,30 @@ class LoanRequestSerializer(serializers.ModelSerializer):
     
     def validate_status(self, value):
         """
-        Ensures that the status value is within allowed choices.
+        Ensures that the status value is within allowed choices and, when
+        updating, that the loan's current status allows the move.
         """
         if value not in dict(LoanApplication.STATUS_CHOICES):
             raise serializers.ValidationError("Invalid status choice")
+        if self.instance is not None and value != self.instance.status \
+                and self.instance.status not in LoanApplication.ALLOWED_TRANSITIONS[value]:
+            raise serializers.ValidationError(f"Loans cannot move from '{self.instance.status}' to '{value}'.")
         return value
 
 
 
     def create(self, validated_data):
         """
-        Creates a loan application and associates it with the requesting user.
-        Status is initialized as 'pending'.
+        Submits a loan application for the requesting user through
+        submit_loan, the same path as the loan_request view.
         """
 
         user = self.context['request'].user 
-        return LoanApplication.objects.create(user=user, status='pending', **validated_data)
+        with transaction.atomic():
+            loan, reasons = submit_loan(
+                user, validated_data, evaluate=settings.LOAN_FRAUD_CHECK_MODE == 'sync'
+            )
+        return loan
 
 
     def update(self, instance, validated_data):
@@ -82,5 +95,101 @@ class LoanRequestSerializer(serializers.ModelSerializer):
         """
 
         instance.status = validated_data.get('status', instance.status)
-        instance.save()
+        instance.save(update_fields=['status', 'date_updated'])
         return instance
+
+
+
+class BulkStatusUpdateSerializer(serializers.Serializer):
+    """
+    Validates an admin bulk status change: a target status plus either an
+    explicit list of loan ids or a filter (current status and/or date range).
+    """
+    status = serializers.ChoiceField(choices=LoanApplication.STATUS_CHOICES)
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False,
+                                allow_empty=False, max_length=10_000)
+    current_status = serializers.ChoiceField(choices=LoanApplication.STATUS_CHOICES, required=False)
+    applied_after = serializers.DateTimeField(required=False)
+    applied_before = serializers.DateTimeField(required=False)
+
+    filter_fields = ('current_status', 'applied_after', 'applied_before')
+
+    def validate(self, attrs):
+        has_filter = any(field in attrs for field in self.filter_fields)
+        if 'ids' in attrs and has_filter:
+            raise serializers.ValidationError("Provide either 'ids' or filter fields, not both.")
+        if 'ids' not in attrs and not has_filter:
+            raise serializers.ValidationError("Provide 'ids' or at least one filter field.")
+        if attrs.get('current_status') and attrs['current_status'] not in LoanApplication.ALLOWED_TRANSITIONS[attrs['status']]:
+            raise serializers.ValidationError(
+                f"Loans cannot move from '{attrs['current_status']}' to '{attrs['status']}'."
+            )
+        return attrs
+
+    def get_queryset(self):
+        """
+        Returns the loans selected by the validated ids or filter.
+        """
+        data = self.validated_data
+        loans = LoanApplication.objects.all()
+        if 'ids' in data:
+            return loans.filter(id__in=data['ids'])
+        if 'current_status' in data:
+            loans = loans.filter(status=data['current_status'])
+        if 'applied_after' in data:
+            loans = loans.filter(date_applied__gte=data['applied_after'])
+        if 'applied_before' in data:
+            loans = loans.filter(date_applied__lt=data['applied_before'])
+        return loans
+
+
+
+# Columns needed to render a loan list row, fetched with a single joined values() query
+LOAN_LIST_FIELDS = (
+    'id', 'amount_requested', 'purpose', 'status', 'date_applied',
+    'user_id', 'user__email', 'user__first_name', 'user__last_name',
+)
+
+
+def loan_list_rows(queryset):
+    """
+    Projects a LoanApplication queryset to the plain rows FastLoanListSerializer renders.
+    """
+    return queryset.values(*LOAN_LIST_FIELDS)
+
+
+class FastLoanListSerializer:
+    """
+    Read-only renderer for loan list pages. Produces the same JSON as
+    LoanRequestSerializer(many=True) from loan_list_rows() dicts, without
+    DRF field machinery or per-row user queries.
+    """
+    amount_places = Decimal('0.01')
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    @property
+    def data(self):
+        self.tz = timezone.get_current_timezone()
+        return [self.to_representation(row) for row in self.rows]
+
+    def to_representation(self, row):
+        return {
+            'user': {
+                'id': str(row['user_id']),
+                'email': row['user__email'],
+                'full_name': f"{row['user__first_name']} {row['user__last_name']}",
+            },
+            'amount_requested': '{:f}'.format(row['amount_requested'].quantize(self.amount_places)),
+            'purpose': row['purpose'],
+            'status': row['status'],
+            'date_applied': self.format_datetime(row['date_applied']),
+        }
+
+    def format_datetime(self, value):
+        # Mirrors rest_framework.fields.DateTimeField ISO 8601 output
+        value = value.astimezone(self.tz).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
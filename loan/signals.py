@@ -1,51 +1,50 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
-from django.conf import settings
 from django.contrib.auth import get_user_model
 
 from .models import FraudFlag, LoanApplication
+from .notifications import invalidate_alert_recipients, queue_fraud_alert
+from .stats import record_change
 
 User = get_user_model()
 
 
 @receiver(post_save, sender=FraudFlag)
 def flagged_loan_notification(sender, instance, created, **kwargs):
+    """
+    Queues the alert for flags saved one at a time (e.g. from the admin).
+    submit_loan_batch and flag_loan bulk-insert flags and call
+    queue_fraud_alerts themselves; rescore_loans sends no alerts.
+    """
     if not created:
         return
 
-    loan = instance.loan_application
-    user = loan.user
-
-    # Get all reasons for this loan
-    reasons = loan.fraud_flags.values_list('reason', flat=True)
-
-    # Get all superuser emails
-    superusers = User.objects.filter(is_superuser=True)
-    recipient_list = [admin.email for admin in superusers if admin.email]
-
-    if not recipient_list:
-        return  
-
-    # Email content
-    subject = f"Loan #{loan.id} flagged for fraud"
-    context = {
-        'loan': loan,
-        'user_full_name': user.get_full_name(),
-        'user_email': user.email,
-        'reasons': reasons,
-    }
-
-    html_body = render_to_string('emails/flagged_loan_alert.html', context)
-    text_body = render_to_string('emails/flagged_loan_alert.txt', context)
-    
-
-    email = EmailMultiAlternatives(
-        subject=subject,
-        body=text_body,
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        to=recipient_list
-    )
-    email.attach_alternative(html_body, "text/html")
-    email.send()
+    # One pending alert per loan, however many flags it gets; `manage.py
+    # send_outbox` renders it (alone or in a digest) and delivers it
+    queue_fraud_alert(instance.loan_application_id)
+
+
+@receiver(post_save, sender=LoanApplication)
+def track_loan_stats_on_save(sender, instance, created, **kwargs):
+    """
+    Keeps LoanDailyStat in step with loans saved one at a time. Bulk writes
+    (bulk_create, queryset updates) update the rollup themselves.
+    """
+    previous = None if created else instance._loaded_stats_key
+    current = instance.stats_key
+
+    if created or (previous is not None and previous != current):
+        record_change(previous, current)
+
+    instance._loaded_stats_key = current
+
+
+@receiver(post_delete, sender=LoanApplication)
+def track_loan_stats_on_delete(sender, instance, **kwargs):
+    record_change(instance._loaded_stats_key or instance.stats_key, None)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def refresh_alert_recipients(sender, **kwargs):
+    invalidate_alert_recipients()
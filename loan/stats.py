@@ -0,0 +1,110 @@
+from datetime import timedelta
+from decimal import Decimal
+from django.conf import settings
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from .models import LoanApplication, LoanDailyStat
+
+
+AMOUNT_PLACES = Decimal('0.01')
+
+
+def add_delta(deltas, day, status, loans, amount):
+    previous_loans, previous_amount = deltas.get((day, status), (0, Decimal('0')))
+    deltas[(day, status)] = (previous_loans + loans, previous_amount + amount)
+
+
+def record_created(loans):
+    """
+    Adds loans inserted without post_save (bulk_create) to the rollup.
+    """
+    deltas = {}
+    for loan in loans:
+        day, status, amount = loan.stats_key
+        add_delta(deltas, day, status, 1, amount)
+        loan._loaded_stats_key = loan.stats_key
+    LoanDailyStat.apply(deltas)
+
+
+def record_change(previous, current):
+    """
+    Moves one loan between rollup cells; either key may be None (insert / delete).
+    """
+    deltas = {}
+    if previous is not None:
+        add_delta(deltas, previous[0], previous[1], -1, -previous[2])
+    if current is not None:
+        add_delta(deltas, current[0], current[1], 1, current[2])
+    LoanDailyStat.apply(deltas)
+
+
+def status_change_deltas(queryset, target_status):
+    """
+    Rollup deltas for moving every loan in ``queryset`` to ``target_status``,
+    from one grouped query. Run it in the transaction that does the UPDATE.
+    """
+    deltas = {}
+    rows = (
+        queryset.annotate(day=TruncDate('date_applied'))
+        .values('day', 'status')
+        .annotate(loans=Count('id'), amount=Sum('amount_requested'))
+        .order_by()
+    )
+    for row in rows:
+        add_delta(deltas, row['day'], row['status'], -row['loans'], -row['amount'])
+        add_delta(deltas, row['day'], target_status, row['loans'], row['amount'])
+    return deltas
+
+
+def loan_stats(days):
+    """
+    Per-status totals and per-day breakdown for the last ``days`` days, read
+    from LoanDailyStat (at most days x statuses rows).
+    """
+    since = timezone.localdate() - timedelta(days=days - 1)
+    statuses = [status for status, label in LoanApplication.STATUS_CHOICES]
+
+    totals = {status: {'count': 0, 'amount': Decimal('0')} for status in statuses}
+    daily = {}
+    for day, status, loans, amount in LoanDailyStat.objects.filter(day__gte=since).values_list(
+        'day', 'status', 'loan_count', 'total_amount'
+    ):
+        totals[status]['count'] += loans
+        totals[status]['amount'] += amount
+        daily.setdefault(day, {status: {'count': 0, 'amount': Decimal('0')} for status in statuses})
+        daily[day][status] = {'count': loans, 'amount': amount}
+
+    def render(cell):
+        return {'count': cell['count'], 'amount': '{:f}'.format(cell['amount'].quantize(AMOUNT_PLACES))}
+
+    return {
+        'since': since.isoformat(),
+        'days': days,
+        'totals': {status: render(cell) for status, cell in totals.items()},
+        'daily': [
+            {'day': day.isoformat(), **{status: render(cell) for status, cell in cells.items()}}
+            for day, cells in sorted(daily.items(), reverse=True)
+        ],
+    }
+
+
+def dashboard_callback(request, context):
+    """
+    UNFOLD["DASHBOARD_CALLBACK"]: adds the loan rollup to the admin index.
+    """
+    stats = loan_stats(settings.LOAN_STATS_DASHBOARD_DAYS)
+    labels = dict(LoanApplication.STATUS_CHOICES)
+
+    context['loan_stats'] = stats
+    context['loan_stats_totals'] = [
+        {'label': labels[status], **cell} for status, cell in stats['totals'].items()
+    ]
+    context['loan_stats_table'] = {
+        'headers': ['Day'] + [labels[status] for status in stats['totals']],
+        'rows': [
+            [row['day']] + [row[status]['count'] for status in stats['totals']]
+            for row in stats['daily']
+        ],
+    }
+    return context
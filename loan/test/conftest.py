@@ -1,7 +1,10 @@
 import pytest
+from django.core.cache import cache
+from account.authentication import user_cache
 
 # Import fixtures from the account app
 from account.test.conftest import user as account_user, auth_client as account_auth_client
+from account.test.conftest import enforce_query_budgets as account_enforce_query_budgets
 
 
 # Re-expose them under the same names so Pytest can discover them in the loan app's tests
@@ -13,6 +16,30 @@ def user(account_user):
 def auth_client(account_auth_client):
     return account_auth_client
 
+@pytest.fixture(autouse=True)
+def enforce_query_budgets(account_enforce_query_budgets):
+    return account_enforce_query_budgets
+
+
+@pytest.fixture(autouse=True)
+def sync_fraud_checks(settings):
+    """
+    Runs fraud checks inside the request so tests can assert on the outcome.
+    """
+    settings.LOAN_FRAUD_CHECK_MODE = 'sync'
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """
+    Cached values (e.g. alert recipients, authenticated users) must not leak between tests.
+    """
+    cache.clear()
+    user_cache.clear()
+    yield
+    cache.clear()
+    user_cache.clear()
+
 
 # Loan-specific fixture
 @pytest.fixture
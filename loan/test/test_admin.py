@@ -0,0 +1,83 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from loan.models import LoanApplication, FraudFlag
+from quickcheck.paginators import EstimatedCountPaginator
+
+User = get_user_model()
+
+# Above the ADMIN_EXACT_COUNT_LIMIT set below, so counts are capped or estimated
+ROWS = 150
+
+
+@pytest.fixture(autouse=True)
+def exact_count_limit(settings):
+    settings.ADMIN_EXACT_COUNT_LIMIT = 100
+
+
+@pytest.fixture
+def admin_client(db):
+    admin = User.objects.create_superuser(
+        email="admin@quickcheck.com", first_name="Ada", last_name="Admin", password="Adminseries1@"
+    )
+    client = Client()
+    client.force_login(admin)
+    return client
+
+
+@pytest.fixture
+def big_tables(db):
+    # The rows are only listed, never logged in with
+    password = make_password(None)
+    users = User.objects.bulk_create([
+        User(email=f"user{n}@example{n % 50}.com", email_domain=f"example{n % 50}.com",
+             first_name="User", last_name=str(n), password=password)
+        for n in range(ROWS)
+    ], batch_size=2000)
+    group = Group.objects.create(name="Reviewers")
+    User.groups.through.objects.bulk_create([
+        User.groups.through(user_id=user.id, group_id=group.id) for user in users[:50]
+    ])
+    loans = LoanApplication.objects.bulk_create([
+        LoanApplication(user=user, amount_requested=1000, purpose="Rent", status="flagged")
+        for user in users
+    ], batch_size=2000)
+    FraudFlag.objects.bulk_create([
+        FraudFlag(loan_application=loan, reason="Shared email domain") for loan in loans
+    ], batch_size=2000)
+    return users
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", [
+    "/admin/loan/loanapplication/",
+    "/admin/loan/loanapplication/?status__exact=flagged",
+    "/admin/loan/loanapplication/?q=user7%40example7.com",
+    "/admin/loan/loanapplication/?_facets=True",
+    "/admin/loan/fraudflag/",
+    "/admin/loan/fraudflag/?_facets=True",
+    "/admin/account/user/",
+    "/admin/account/user/?q=not-a-uuid",
+])
+def test_changelist_queries_are_bounded(admin_client, big_tables, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get(url)
+
+    assert response.status_code == 200
+    # session, admin user, capped count, row estimate, page (+ groups prefetch)
+    assert len(queries) <= 6
+    counts = [query["sql"] for query in queries.captured_queries if "COUNT(" in query["sql"]]
+    assert all("LIMIT" in sql for sql in counts)
+
+
+@pytest.mark.django_db
+def test_estimated_count_paginator(big_tables):
+    # Unfiltered: the table estimate; filtered: capped at the limit
+    assert EstimatedCountPaginator(LoanApplication.objects.all(), 25).count == ROWS
+    assert EstimatedCountPaginator(LoanApplication.objects.filter(status="flagged"), 25).count == 101
+    assert EstimatedCountPaginator(LoanApplication.objects.filter(amount_requested__gt=5000), 25).count == 0
@@ -0,0 +1,172 @@
+import asyncio
+import statistics
+import threading
+import time
+import pytest
+import logging
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import AsyncClient
+from rest_framework.test import APIClient
+
+from rest_framework_simplejwt.tokens import RefreshToken
+from loan.models import LoanApplication, LoanVelocityBucket, FraudFlag, PendingFraudAlert
+from loan.velocity import recent_submission_count
+
+logger = logging.getLogger(__name__)
+
+
+def bearer(user):
+    return f"Bearer {RefreshToken.for_user(user).access_token}"
+
+
+def async_get(client, url):
+    return async_to_sync(client.get)(url)
+
+
+@pytest.fixture
+def async_client(user):
+    return AsyncClient(AUTHORIZATION=bearer(user))
+
+
+@pytest.mark.django_db
+def test_async_loan_request_flags_like_the_sync_view(async_client, user):
+    response = async_to_sync(async_client.post)(
+        f"/loan/loan-request/{user.id}/",
+        data={"amount_requested": "10000000.00", "purpose": "Warehouse"},
+        content_type="application/json",
+    )
+
+    assert response.status_code == 201
+    assert response.json()["detail"] == "Loan submitted and flagged for review."
+    assert any("₦5,000,000" in reason for reason in response.json()["reasons"])
+    loan = LoanApplication.objects.get()
+    assert loan.status == "flagged"
+    assert FraudFlag.objects.filter(loan_application=loan).exists()
+    assert PendingFraudAlert.objects.filter(loan_application=loan).exists()
+
+
+@pytest.mark.django_db
+def test_async_velocity_counts_earlier_submissions(async_client, user, loan_payload):
+    statuses = []
+    for _ in range(3):
+        response = async_to_sync(async_client.post)(
+            f"/loan/loan-request/{user.id}/", data=loan_payload, content_type="application/json"
+        )
+        statuses.append(response.json()["detail"])
+
+    assert statuses[-1] == "Loan submitted and flagged for review."
+    assert list(LoanApplication.objects.order_by("id").values_list("status", flat=True)) == [
+        "pending", "pending", "flagged"
+    ]
+
+
+@pytest.mark.django_db
+def test_async_failed_insert_leaves_velocity_untouched(async_client, user, loan_payload, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError("insert failed")
+
+    monkeypatch.setattr(LoanApplication.objects, "bulk_create", fail)
+    with pytest.raises(RuntimeError):
+        async_to_sync(async_client.post)(
+            f"/loan/loan-request/{user.id}/", data=loan_payload, content_type="application/json"
+        )
+
+    assert not LoanVelocityBucket.objects.exists()
+    assert recent_submission_count(user) == 0
+
+
+@pytest.mark.django_db
+def test_async_loan_list_matches_the_wsgi_response(async_client, auth_client, user):
+    LoanApplication.objects.bulk_create([
+        LoanApplication(user=user, amount_requested=1000 + i, purpose=f"Loan {i}") for i in range(15)
+    ])
+
+    for query in ("", "?limit=5&offset=5", "?pagination=cursor&limit=4"):
+        url = f"/loan/retrieve-all-loans/{user.id}/{query}"
+        assert async_get(async_client, url).json() == auth_client.get(url).json()
+
+
+@pytest.mark.django_db
+def test_async_flagged_loans_requires_an_admin(async_client):
+    assert async_get(async_client, "/loan/admin/flagged-loans/").status_code == 403
+
+    response = async_get(AsyncClient(), "/loan/admin/flagged-loans/")
+    assert response.status_code == 401
+    assert response.headers["WWW-Authenticate"].startswith("Bearer")
+
+
+@pytest.mark.django_db
+def test_async_loan_request_accepts_form_bodies(async_client, user, loan_payload):
+    response = async_to_sync(async_client.post)(f"/loan/loan-request/{user.id}/", data=loan_payload)
+
+    assert response.status_code == 201
+    assert LoanApplication.objects.filter(user=user).count() == 1
+
+
+@pytest.mark.django_db
+def test_async_loan_views_reject_other_methods_as_drf_does(async_client, auth_client, user):
+    for method, url in (("get", f"/loan/loan-request/{user.id}/"), ("post", f"/loan/retrieve-all-loans/{user.id}/")):
+        response = async_to_sync(getattr(async_client, method))(url)
+
+        assert response.status_code == 405
+        assert response.json() == getattr(auth_client, method)(url).json()
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db(transaction=True)
+def test_async_vs_wsgi_benchmark(user):
+    """
+    100 concurrent clients, 5 loan-history requests each: WSGI (one thread
+    per client, DRF views) against ASGI (one coroutine per client, async views).
+    """
+    clients, rounds = 100, 5
+    LoanApplication.objects.bulk_create([
+        LoanApplication(user=user, amount_requested=1000 + i, purpose=f"Loan {i}") for i in range(50)
+    ])
+    url = f"/loan/retrieve-all-loans/{user.id}/"
+    header = bearer(user)
+
+    def wsgi_client(latencies, statuses):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=header)
+        for _ in range(rounds):
+            started = time.perf_counter()
+            statuses.append(client.get(url).status_code)
+            latencies.append(time.perf_counter() - started)
+        connection.close()
+
+    wsgi_latencies, wsgi_statuses = [], []
+    threads = [threading.Thread(target=wsgi_client, args=(wsgi_latencies, wsgi_statuses)) for _ in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wsgi_elapsed = time.perf_counter() - started
+
+    async def asgi_client(latencies, statuses):
+        client = AsyncClient(AUTHORIZATION=header)
+        for _ in range(rounds):
+            started = time.perf_counter()
+            statuses.append((await client.get(url)).status_code)
+            latencies.append(time.perf_counter() - started)
+
+    async def run_asgi(latencies, statuses):
+        await asyncio.gather(*(asgi_client(latencies, statuses) for _ in range(clients)))
+
+    asgi_latencies, asgi_statuses = [], []
+    started = time.perf_counter()
+    async_to_sync(run_asgi)(asgi_latencies, asgi_statuses)
+    asgi_elapsed = time.perf_counter() - started
+
+    def p95(latencies):
+        return statistics.quantiles(latencies, n=20)[-1] * 1000
+
+    total = clients * rounds
+    logger.info(
+        "%s clients x %s requests | WSGI: %.0f req/s, p95 %.1fms | ASGI: %.0f req/s, p95 %.1fms",
+        clients, rounds, total / wsgi_elapsed, p95(wsgi_latencies), total / asgi_elapsed, p95(asgi_latencies),
+    )
+    assert set(wsgi_statuses) == set(asgi_statuses) == {200}
+    assert len(asgi_statuses) == total
@@ -0,0 +1,51 @@
+import io
+import json
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from loan.management.commands.bench import SCENARIOS
+
+
+def bench(*args, out=None):
+    out = out or io.StringIO()
+    call_command(
+        "bench", "--current-db", "--users", "10", "--loans", "60", "--requests", "4", "--threads", "2",
+        *args, stdout=out,
+    )
+    return json.loads(out.getvalue())
+
+
+@pytest.mark.django_db(transaction=True)
+def test_bench_drives_every_scenario(settings, tmp_path):
+    settings.PASSWORD_HASH_ITERATIONS = 1_000
+    baseline = tmp_path / "baseline.json"
+
+    report = bench("--output", str(baseline))
+
+    assert set(report["results"]) == set(SCENARIOS)
+    for name, modes in report["results"].items():
+        for mode in ("sequential", "concurrent"):
+            result = modes[mode]
+            assert result["requests"] == 4 and result["errors"] == 0, (name, mode, result)
+            assert result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"]
+            assert result["queries_per_request"] > 0
+    assert json.loads(baseline.read_text()) == report
+
+
+@pytest.mark.django_db(transaction=True)
+def test_bench_compares_with_baseline(settings, tmp_path):
+    settings.PASSWORD_HASH_ITERATIONS = 1_000
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"results": {"retrieve_all_loans": {"sequential": {
+        "throughput": 1_000_000.0, "p95_ms": 0.001, "queries_per_request": 0.0,
+    }}}}))
+
+    out = io.StringIO()
+    with pytest.raises(CommandError, match="Latency regressed"):
+        bench("--scenario", "retrieve_all_loans", "--baseline", str(baseline), "--max-regression", "0.2", out=out)
+
+    # The report is still printed before the command fails
+    report = json.loads(out.getvalue())
+    assert report["comparison"]["retrieve_all_loans"]["sequential"]["p95_ms_change"] > 1
+    assert "concurrent" not in report["comparison"]["retrieve_all_loans"]
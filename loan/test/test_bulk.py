@@ -0,0 +1,105 @@
+import time
+import pytest
+import logging
+from django.db import connection
+
+from loan.models import LoanApplication, FraudFlag, PendingFraudAlert
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.mark.django_db
+def test_bulk_submission_returns_per_item_results(auth_client, user):
+    payload = [
+        {"amount_requested": "50000.00", "purpose": "Inventory"},
+        {"amount_requested": "10000000.00", "purpose": "Warehouse"},
+        {"amount_requested": "20000.00", "purpose": "Payroll"},
+    ]
+
+    response = auth_client.post(f"/loan/loan-request/{user.id}/bulk/", data=payload, format="json")
+
+    assert response.status_code == 201
+    results = response.data["results"]
+    assert [item["status"] for item in results] == ["pending", "flagged", "flagged"]
+    assert any("₦5,000,000" in reason for reason in results[1]["reasons"])
+    # Third loan of the batch trips the 24h velocity rule
+    assert any("last 24 hours" in reason for reason in results[2]["reasons"])
+    assert FraudFlag.objects.count() == 2
+    assert PendingFraudAlert.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_bulk_submission_rejects_invalid_items(auth_client, user):
+    payload = [
+        {"amount_requested": "50000.00", "purpose": "Inventory"},
+        {"amount_requested": "-1.00", "purpose": "12345"},
+    ]
+
+    response = auth_client.post(f"/loan/loan-request/{user.id}/bulk/", data=payload, format="json")
+
+    assert response.status_code == 400
+    assert response.data[0] == {}
+    assert "amount_requested" in response.data[1]
+    assert not LoanApplication.objects.exists()
+
+
+class QueryCounter:
+    """
+    Counts executed queries without the 9,000-entry cap of connection.queries.
+    """
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+@pytest.mark.django_db
+def test_bulk_submission_query_count_does_not_grow_with_the_batch(auth_client, user, settings):
+    settings.LOAN_FRAUD_VELOCITY_LIMIT = 10_000
+    counts = []
+    # The first batch also creates the user's velocity bucket and stats rows
+    for size in (1, 2, 20):
+        queries = QueryCounter()
+        with connection.execute_wrapper(queries):
+            response = auth_client.post(
+                f"/loan/loan-request/{user.id}/bulk/",
+                data=[{"amount_requested": "50000.00", "purpose": "Stock"}] * size, format="json",
+            )
+        assert response.status_code == 201
+        counts.append(queries.count)
+
+    assert counts[1] == counts[2]
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_bulk_vs_single_submission_benchmark(auth_client, user):
+    """
+    1,000 single submissions against one 1,000-item batch.
+    """
+    size = 1000
+    item = {"amount_requested": "50000.00", "purpose": "Benchmark"}
+
+    single_queries = QueryCounter()
+    started = time.perf_counter()
+    with connection.execute_wrapper(single_queries):
+        for _ in range(size):
+            auth_client.post(f"/loan/loan-request/{user.id}/", data=item, format="json")
+    single_elapsed = time.perf_counter() - started
+
+    bulk_queries = QueryCounter()
+    started = time.perf_counter()
+    with connection.execute_wrapper(bulk_queries):
+        response = auth_client.post(f"/loan/loan-request/{user.id}/bulk/", data=[item] * size, format="json")
+    bulk_elapsed = time.perf_counter() - started
+
+    logger.info(
+        "%s single submissions: %.2fs, %s queries | one %s-item batch: %.2fs, %s queries",
+        size, single_elapsed, single_queries.count, size, bulk_elapsed, bulk_queries.count,
+    )
+
+    assert response.status_code == 201
+    assert LoanApplication.objects.count() == 2 * size
+    assert bulk_queries.count < single_queries.count / 10
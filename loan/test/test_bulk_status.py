@@ -0,0 +1,80 @@
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from loan.models import LoanApplication
+
+User = get_user_model()
+
+URL = "/loan/admin/loans/bulk-status/"
+
+
+@pytest.fixture
+def admin_client(db):
+    admin = User.objects.create_superuser(
+        email="admin@quickcheck.com", first_name="Ada", last_name="Admin", password="Adminseries1@"
+    )
+    client = APIClient()
+    client.force_authenticate(admin)
+    return client
+
+
+@pytest.fixture
+def loans(user):
+    return LoanApplication.objects.bulk_create([
+        LoanApplication(user=user, amount_requested=1000, purpose="Rent", status=status)
+        for status in ("flagged", "flagged", "pending", "approved")
+    ])
+
+
+@pytest.mark.django_db
+def test_bulk_status_by_ids_skips_disallowed_transitions(admin_client, loans, django_assert_max_num_queries):
+    ids = [loan.id for loan in loans]
+
+    # rollup aggregate, the UPDATE and the LoanDailyStat upsert
+    with django_assert_max_num_queries(3):
+        response = admin_client.patch(URL, data={"ids": ids, "status": "rejected"}, format="json")
+
+    assert response.status_code == 200
+    assert response.data["updated"] == 3
+    assert response.data["skipped"] == 1
+    assert LoanApplication.objects.get(pk=loans[3].pk).status == "approved"
+
+
+@pytest.mark.django_db
+def test_bulk_status_by_filter(admin_client, loans):
+    response = admin_client.patch(URL, data={"current_status": "flagged", "status": "approved"}, format="json")
+
+    assert response.data["updated"] == 2
+    assert LoanApplication.objects.filter(status="approved").count() == 3
+
+
+@pytest.mark.django_db
+def test_bulk_status_rejects_invalid_requests(admin_client, loans, auth_client):
+    assert admin_client.patch(URL, data={"status": "approved"}, format="json").status_code == 400
+    response = admin_client.patch(URL, data={"current_status": "approved", "status": "pending"}, format="json")
+    assert response.status_code == 400
+    assert auth_client.patch(URL, data={"ids": [loans[0].id], "status": "approved"}, format="json").status_code == 403
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("current, target, allowed", [
+    ("pending", "approved", True),
+    ("flagged", "pending", True),
+    ("approved", "pending", False),
+    ("rejected", "pending", False),
+    ("approved", "rejected", False),
+])
+def test_single_status_update_respects_allowed_transitions(admin_client, user, current, target, allowed):
+    loan = LoanApplication.objects.create(user=user, amount_requested=1000, purpose="Rent", status=current)
+
+    response = admin_client.patch(f"/loan/admin/loan/{loan.id}/", data={"status": target}, format="json")
+
+    loan.refresh_from_db()
+    if allowed:
+        assert response.status_code == 200
+        assert loan.status == target
+    else:
+        assert response.status_code == 400
+        assert response.data == {"status": [f"Loans cannot move from '{current}' to '{target}'."]}
+        assert loan.status == current
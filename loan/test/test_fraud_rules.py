@@ -0,0 +1,55 @@
+import pytest
+
+from loan.fraud import FraudContext, FraudEngine, FraudRule, RULE_REGISTRY, register_rule
+
+
+@pytest.mark.django_db
+def test_rules_run_cheapest_first_and_record_timings(user):
+    engine = FraudEngine()
+    evaluation = engine.evaluate(FraudContext(user, 10_000_000))
+
+    assert [rule.name for rule in engine.rules][0] == "amount_cap"
+    assert evaluation.fired == ["amount_cap"]
+    assert set(evaluation.timings) == {"amount_cap", "velocity", "shared_email_domain"}
+
+
+@pytest.mark.django_db
+def test_short_circuit_skips_database_rules(user, django_assert_num_queries):
+    engine = FraudEngine(short_circuit=True)
+
+    with django_assert_num_queries(0):
+        evaluation = engine.evaluate(FraudContext(user, 10_000_000))
+
+    assert evaluation.flagged
+    assert list(evaluation.timings) == ["amount_cap"]
+
+
+@pytest.mark.django_db
+def test_thresholds_come_from_settings(user, settings):
+    settings.LOAN_FRAUD_AMOUNT_CAP = 1_000
+
+    evaluation = FraudEngine().evaluate(FraudContext(user, 5_000, recent_loans=0, domain_count=0))
+
+    assert evaluation.reasons == ["Requested amount exceeds ₦1,000."]
+
+
+@pytest.mark.django_db
+def test_registered_rule_can_be_enabled(user, settings):
+    @register_rule
+    class RoundAmountRule(FraudRule):
+        name = "round_amount"
+        cost = 1
+
+        def fires(self, features):
+            return features["amount_requested"] % 1_000_000 == 0
+
+        def reason(self, features):
+            return "Requested amount is a round million."
+
+    try:
+        settings.LOAN_FRAUD_RULES = ["round_amount", "amount_cap"]
+        evaluation = FraudEngine().evaluate(FraudContext(user, 2_000_000))
+    finally:
+        RULE_REGISTRY.pop("round_amount")
+
+    assert evaluation.reasons == ["Requested amount is a round million."]
@@ -0,0 +1,63 @@
+import pytest
+from django.core.management import call_command
+
+from loan.models import LoanApplication, FraudCheckJob, PendingFraudAlert
+
+
+@pytest.mark.django_db
+def test_async_submission_is_queued_and_evaluated_by_worker(auth_client, user, settings):
+    settings.LOAN_FRAUD_CHECK_MODE = 'async'
+    payload = {"amount_requested": "10000000.00", "purpose": "Suspiciously large request"}
+
+    response = auth_client.post(f"/loan/loan-request/{user.id}/", data=payload, format="json")
+
+    assert response.status_code == 201
+    assert response.data["status"] == "pending"
+    job = FraudCheckJob.objects.get(loan_application_id=response.data["loan_id"])
+    assert job.status == "queued"
+    assert job.recent_loans == 1
+
+    call_command("fraud_worker", "--once")
+
+    job.refresh_from_db()
+    loan = LoanApplication.objects.get(pk=response.data["loan_id"])
+    assert job.status == "done"
+    assert loan.status == "flagged"
+    assert loan.fraud_flags.filter(reason__contains="₦5,000,000").exists()
+
+
+@pytest.mark.django_db
+def test_failed_job_is_requeued_until_max_attempts(user, settings, monkeypatch):
+    settings.LOAN_FRAUD_JOB_MAX_ATTEMPTS = 2
+    loan = LoanApplication.objects.create(user=user, amount_requested=100, purpose="Rent")
+    job = FraudCheckJob.objects.create(loan_application=loan)
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr("loan.jobs.evaluate_loan", broken)
+
+    call_command("fraud_worker", "--once")
+
+    job.refresh_from_db()
+    assert job.status == "failed"
+    assert job.attempts == 2
+    assert job.last_error == "boom"
+
+
+@pytest.mark.django_db
+def test_worker_leaves_loans_decided_before_it_ran(auth_client, user, settings):
+    settings.LOAN_FRAUD_CHECK_MODE = 'async'
+    payload = {"amount_requested": "10000000.00", "purpose": "Suspiciously large request"}
+    loan_id = auth_client.post(f"/loan/loan-request/{user.id}/", data=payload, format="json").data["loan_id"]
+    loan = LoanApplication.objects.get(pk=loan_id)
+    loan.status = "approved"
+    loan.save(update_fields=["status", "date_updated"])
+
+    call_command("fraud_worker", "--once")
+
+    loan.refresh_from_db()
+    assert loan.status == "approved"
+    assert not loan.fraud_flags.exists()
+    assert not PendingFraudAlert.objects.exists()
+    assert FraudCheckJob.objects.get(loan_application=loan).status == "done"
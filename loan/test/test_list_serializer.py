@@ -0,0 +1,76 @@
+import time
+import pytest
+import logging
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from loan.models import LoanApplication
+from loan.serializers import LoanRequestSerializer, FastLoanListSerializer, loan_list_rows
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+
+def create_loans(users, per_user):
+    LoanApplication.objects.bulk_create([
+        LoanApplication(user=user, amount_requested=f"{1000 + i}.5", purpose=f"Loan {i}", status="flagged")
+        for user in users
+        for i in range(per_user)
+    ])
+
+
+@pytest.fixture
+def borrowers(db):
+    return [
+        User.objects.create_user(email=f"borrower{i}@example.com", first_name="Bo", last_name=f"Rower{i}", password="x")
+        for i in range(5)
+    ]
+
+
+@pytest.mark.django_db
+def test_fast_serializer_matches_drf_output(borrowers):
+    create_loans(borrowers, 3)
+    loans = LoanApplication.objects.order_by('-date_applied', '-id')
+
+    expected = LoanRequestSerializer(loans, many=True).data
+    actual = FastLoanListSerializer(loan_list_rows(loans)).data
+
+    assert actual == [dict(item, user=dict(item["user"])) for item in expected]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("per_user", [2, 20])
+def test_flagged_loans_page_query_count_is_constant(borrowers, per_user, django_assert_num_queries):
+    admin = User.objects.create_superuser(email="admin@quickcheck.com", first_name="Ada", last_name="Admin", password="x")
+    create_loans(borrowers, per_user)
+
+    client = APIClient()
+    client.force_authenticate(admin)
+
+    # COUNT(*) + one joined page query, whatever the number of users on the page
+    with django_assert_num_queries(2):
+        response = client.get("/loan/admin/flagged-loans/?limit=10")
+
+    assert len(response.data["results"]) == 10
+
+
+@pytest.mark.django_db
+def test_list_serialization_throughput(borrowers):
+    create_loans(borrowers, 1000)
+    loans = list(LoanApplication.objects.select_related('user').order_by('-date_applied', '-id'))
+    rows = list(loan_list_rows(LoanApplication.objects.order_by('-date_applied', '-id')))
+
+    started = time.perf_counter()
+    LoanRequestSerializer(loans, many=True).data
+    drf_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    FastLoanListSerializer(rows).data
+    fast_elapsed = time.perf_counter() - started
+
+    logger.info(
+        f"Serialized {len(rows)} loans: DRF {len(rows) / drf_elapsed:,.0f} rows/s, "
+        f"fast path {len(rows) / fast_elapsed:,.0f} rows/s"
+    )
+    assert fast_elapsed < drf_elapsed
@@ -0,0 +1,121 @@
+import json
+import logging
+import threading
+import time
+import pytest
+
+from loan.models import LoanApplication
+from quickcheck.log import JsonFormatter, QueueListenerHandler
+
+logger = logging.getLogger(__name__)
+
+LOAN_LOGGER = logging.getLogger("loan")
+
+
+class CaptureHandler(logging.Handler):
+    """
+    Sees records after the queue handler's ContextFilter has run.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def captured():
+    handler = CaptureHandler()
+    LOAN_LOGGER.addHandler(handler)
+    yield handler.records
+    LOAN_LOGGER.removeHandler(handler)
+
+
+def queue_handler():
+    return next(handler for handler in LOAN_LOGGER.handlers if isinstance(handler, QueueListenerHandler))
+
+
+@pytest.mark.django_db
+def test_records_carry_request_user_and_loan_ids(auth_client, user, captured):
+    response = auth_client.post(
+        f"/loan/loan-request/{user.id}/",
+        data={"amount_requested": "50000.00", "purpose": "Stock"},
+        format="json",
+        HTTP_X_REQUEST_ID="req-123",
+    )
+
+    assert response["X-Request-ID"] == "req-123"
+    submitted = next(record for record in captured if "submitted successfully" in record.getMessage())
+    entry = json.loads(JsonFormatter().format(submitted))
+    assert entry["request_id"] == "req-123"
+    assert entry["user_id"] == str(user.id)
+    assert entry["loan_id"] == LoanApplication.objects.get().id
+
+
+@pytest.mark.django_db
+def test_stream_io_happens_off_the_request_thread(auth_client, user, monkeypatch):
+    target = queue_handler().listener.handlers[0]
+    threads = []
+    original_emit = target.emit
+    monkeypatch.setattr(target, "emit", lambda record: threads.append(threading.current_thread()) or original_emit(record))
+
+    auth_client.post(f"/loan/loan-request/{user.id}/", data={"amount_requested": "50000.00", "purpose": "Stock"}, format="json")
+    deadline = time.monotonic() + 2
+    while not threads and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert threads
+    assert threading.current_thread() not in threads
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_logging_overhead_per_loan_request_benchmark(auth_client, user, monkeypatch, settings):
+    """
+    Time spent inside logger calls per (unflagged) loan_request: at INFO
+    through the queue, at INFO with the old synchronous StreamHandler, and
+    at WARNING. Logger methods are wrapped at the class level, so the level
+    check, record creation, filtering and enqueueing are all counted.
+    """
+    settings.LOAN_FRAUD_VELOCITY_LIMIT = 10_000
+    spent = []
+
+    def timed(method):
+        def wrapper(self, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                spent.append(time.perf_counter() - started)
+        return wrapper
+
+    for name in ("debug", "info", "warning", "error", "exception"):
+        monkeypatch.setattr(logging.Logger, name, timed(getattr(logging.Logger, name)))
+
+    queued = queue_handler()
+    console = queued.listener.handlers[0]
+    runs = 30
+    results = {}
+    for label, level, handler in (
+        ("INFO queued", logging.INFO, queued),
+        ("INFO synchronous", logging.INFO, console),
+        ("WARNING queued", logging.WARNING, queued),
+    ):
+        monkeypatch.setattr(LOAN_LOGGER, "level", level)
+        monkeypatch.setattr(LOAN_LOGGER, "handlers", [handler])
+        LOAN_LOGGER.manager._clear_cache()
+        spent.clear()
+        for _ in range(runs):
+            auth_client.post(
+                f"/loan/loan-request/{user.id}/", data={"amount_requested": "50000.00", "purpose": "Stock"}, format="json"
+            )
+        results[label] = sum(spent) / runs * 1e6
+    monkeypatch.undo()
+    LOAN_LOGGER.manager._clear_cache()
+
+    logger.info(
+        "Logging overhead per loan_request: %s",
+        ", ".join(f"{label} {micros:.1f} us" for label, micros in results.items()),
+    )
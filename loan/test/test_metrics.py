@@ -0,0 +1,105 @@
+import logging
+import re
+import statistics
+import time
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import Client
+from rest_framework.test import APIClient
+
+from quickcheck.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    registry.reset()
+    yield
+    registry.reset()
+
+
+def sample(text, line):
+    match = re.search(rf"^{re.escape(line)} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+
+@pytest.mark.django_db
+def test_metrics_report_views_queries_serialization_and_rules(auth_client, user, settings):
+    settings.METRICS_ALLOWED_IPS = ["127.0.0.1"]
+    auth_client.post(f"/loan/loan-request/{user.id}/", data={"amount_requested": "50000.00", "purpose": "Stock"}, format="json")
+    auth_client.get(f"/loan/retrieve-all-loans/{user.id}/")
+
+    response = Client().get("/metrics")
+
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+    text = response.content.decode()
+    assert sample(text, 'quickcheck_requests_total{status="201",view="loan_request"}') == 1
+    assert sample(text, 'quickcheck_request_duration_seconds_count{view="loan_request"}') == 1
+    assert sample(text, 'quickcheck_request_db_queries_sum{view="loan_request"}') > 0
+    assert sample(text, 'quickcheck_request_db_seconds_sum{view="retrieve_all_loans"}') > 0
+    assert sample(text, 'quickcheck_request_serialization_seconds_count{view="retrieve_all_loans"}') == 1
+    assert sample(text, 'quickcheck_fraud_rule_seconds_count{rule="amount_cap"}') == 1
+    assert sample(text, 'quickcheck_request_duration_seconds_bucket{view="loan_request",le="+Inf"}') == 1
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_is_staff_only_by_default(user):
+    assert Client(REMOTE_ADDR="10.0.0.7").get("/metrics").status_code == 403
+    assert Client(REMOTE_ADDR="127.0.0.1").get("/metrics").status_code == 403
+
+    client = Client(REMOTE_ADDR="10.0.0.7")
+    client.force_login(User.objects.create_superuser(
+        email="admin@quickcheck.com", first_name="Ada", last_name="Admin", password="Adminseries1@"
+    ))
+    assert client.get("/metrics").status_code == 200
+
+
+def test_metrics_endpoint_allows_configured_networks(settings):
+    settings.METRICS_ALLOWED_IPS = ["10.0.0.0/24"]
+
+    assert Client(REMOTE_ADDR="10.0.0.7").get("/metrics").status_code == 200
+    assert Client(REMOTE_ADDR="10.0.1.7").get("/metrics").status_code == 403
+
+
+@pytest.mark.django_db
+def test_metrics_switch_turns_collection_off(user, settings):
+    settings.METRICS_ENABLED = False
+    client = APIClient()
+    client.force_authenticate(user)
+
+    client.get(f"/loan/retrieve-all-loans/{user.id}/")
+
+    assert registry.render().strip() == ""
+    assert client.get("/metrics").status_code == 404
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_metrics_overhead_benchmark(user, settings):
+    """
+    Median loan-history request time with metrics on and off, interleaved.
+    """
+    clients = {}
+    for enabled in (True, False):
+        settings.METRICS_ENABLED = enabled
+        clients[enabled] = APIClient()
+        clients[enabled].force_authenticate(user)
+        clients[enabled].get(f"/loan/retrieve-all-loans/{user.id}/")
+
+    timings = {True: [], False: []}
+    for _ in range(100):
+        for enabled, client in clients.items():
+            settings.METRICS_ENABLED = enabled
+            started = time.perf_counter()
+            client.get(f"/loan/retrieve-all-loans/{user.id}/")
+            timings[enabled].append(time.perf_counter() - started)
+
+    on, off = statistics.median(timings[True]), statistics.median(timings[False])
+    logger.info(
+        "Metrics overhead per request: %.1f us on, %.1f us off (%.1f%%)",
+        on * 1e6, off * 1e6, (on - off) / off * 100,
+    )
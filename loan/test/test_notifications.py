@@ -0,0 +1,80 @@
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.contrib.auth import get_user_model
+
+from loan.models import LoanApplication, OutboundEmail, PendingFraudAlert
+from loan.notifications import flush_fraud_alerts
+from loan.utils import flag_loan
+
+User = get_user_model()
+
+
+@pytest.fixture
+def superuser(db):
+    return User.objects.create_superuser(
+        email="admin@quickcheck.com", first_name="Ada", last_name="Admin", password="Adminseries1@"
+    )
+
+
+@pytest.mark.django_db
+def test_flag_alert_is_queued_then_sent_by_outbox(auth_client, user, superuser, settings):
+    settings.LOAN_ALERT_DIGEST_WINDOW = 0
+    payload = {"amount_requested": "10000000.00", "purpose": "Suspiciously large request"}
+    auth_client.post(f"/loan/loan-request/{user.id}/", data=payload, format="json")
+
+    assert PendingFraudAlert.objects.count() == 1
+    assert flush_fraud_alerts() == 1
+
+    queued = OutboundEmail.objects.get()
+    assert queued.status == "pending"
+    assert queued.recipients == [superuser.email]
+    assert mail.outbox == []
+
+    call_command("send_outbox", "--once")
+
+    queued.refresh_from_db()
+    assert queued.status == "sent"
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].subject == queued.subject
+
+
+@pytest.mark.django_db
+def test_failed_delivery_is_retried_with_backoff(superuser, monkeypatch):
+    message = OutboundEmail.objects.create(subject="Alert", text_body="body", recipients=[superuser.email])
+
+    def refuse(self, *args, **kwargs):
+        raise ConnectionError("mail server unavailable")
+
+    monkeypatch.setattr("django.core.mail.EmailMultiAlternatives.send", refuse)
+    call_command("send_outbox", "--once")
+
+    message.refresh_from_db()
+    assert message.status == "pending"
+    assert message.attempts == 1
+    assert message.next_attempt_at > message.created_at
+    assert "unavailable" in message.last_error
+
+
+@pytest.mark.django_db
+def test_flagged_loans_are_coalesced_into_one_digest(user, superuser, settings):
+    settings.LOAN_ALERT_DIGEST_WINDOW = 60
+    settings.LOAN_ALERT_DIGEST_MAX_LOANS = 3
+    loans = [LoanApplication.objects.create(user=user, amount_requested=100, purpose="Rent") for _ in range(3)]
+
+    flag_loan(loans[0], ["first reason", "second reason"])
+    flag_loan(loans[1], ["third reason"])
+
+    # Two loans, three flags: still inside the window, nothing is sent yet
+    assert PendingFraudAlert.objects.count() == 2
+    assert flush_fraud_alerts() == 0
+
+    flag_loan(loans[2], ["fourth reason"])
+    assert flush_fraud_alerts() == 3
+
+    digest = OutboundEmail.objects.get()
+    assert digest.subject == "3 loan(s) flagged for fraud"
+    for loan in loans:
+        assert f"Loan ID: {loan.id}" in digest.text_body
+    assert digest.text_body.count("first reason") == 1
+    assert not PendingFraudAlert.objects.exists()
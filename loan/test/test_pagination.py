@@ -0,0 +1,92 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+
+from loan.models import LoanApplication
+
+User = get_user_model()
+
+
+@pytest.fixture
+def many_loans(user):
+    loans = LoanApplication.objects.bulk_create([
+        LoanApplication(user=user, amount_requested=1000 + i, purpose=f"Loan {i}", status="flagged")
+        for i in range(25)
+    ])
+    # Several loans share a timestamp so the id tie-breaker matters
+    same_moment = timezone.now()
+    LoanApplication.objects.filter(pk__in=[loan.pk for loan in loans[:10]]).update(date_applied=same_moment)
+    return loans
+
+
+@pytest.fixture
+def admin_client(db):
+    admin = User.objects.create_superuser(
+        email="admin@quickcheck.com", first_name="Ada", last_name="Admin", password="Adminseries1@"
+    )
+    client = APIClient()
+    client.force_authenticate(admin)
+    return client
+
+
+def walk_pages(client, url):
+    seen, pages = [], []
+    response = client.get(url)
+    while True:
+        pages.append(response)
+        seen.extend(row["amount_requested"] for row in response.data["results"])
+        if not response.data["next"]:
+            return seen, pages
+        response = client.get(response.data["next"])
+
+
+@pytest.mark.django_db
+def test_cursor_pages_cover_every_loan_once(auth_client, user, many_loans):
+    seen, pages = walk_pages(auth_client, f"/loan/retrieve-all-loans/{user.id}/?pagination=cursor&limit=7")
+
+    assert len(pages) == 4
+    assert pages[0].data["count"] == 25
+    assert sorted(seen) == sorted(f"{loan.amount_requested:.2f}" for loan in many_loans)
+    assert len(set(seen)) == 25
+
+
+@pytest.mark.django_db
+def test_deep_cursor_page_costs_the_same_as_the_first(admin_client, many_loans):
+    url = "/loan/admin/flagged-loans/?pagination=cursor&limit=5&include_total=false"
+
+    with CaptureQueriesContext(connection) as first:
+        response = admin_client.get(url)
+    assert "count" not in response.data
+
+    for _ in range(3):
+        response = admin_client.get(response.data["next"])
+    with CaptureQueriesContext(connection) as deep:
+        admin_client.get(response.data["next"])
+
+    assert len(deep) == len(first)
+    assert not any("COUNT(" in query["sql"] for query in deep.captured_queries)
+
+
+@pytest.mark.django_db
+def test_invalid_cursor_is_rejected(auth_client, user):
+    response = auth_client.get(f"/loan/retrieve-all-loans/{user.id}/?cursor=not-a-cursor")
+
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("query", ["", "?offset=0", "?limit=5&offset=0", "?pagination=cursor"])
+def test_empty_flagged_queue_message_on_any_first_page(admin_client, query):
+    response = admin_client.get(f"/loan/admin/flagged-loans/{query}")
+
+    assert response.data == {"detail": "No flagged loan applications at this time."}
+
+
+@pytest.mark.django_db
+def test_empty_page_past_the_flagged_queue_is_paginated(admin_client):
+    response = admin_client.get("/loan/admin/flagged-loans/?offset=10")
+
+    assert response.data["results"] == []
@@ -0,0 +1,54 @@
+import pytest
+from django.conf import settings
+
+from account import urls as account_urls
+from loan import urls as loan_urls
+from quickcheck import query_budget
+from quickcheck.query_budget import QueryBudgetExceeded
+
+
+def test_every_api_route_has_a_budget():
+    names = [pattern.name for module in (account_urls, loan_urls) for pattern in module.urlpatterns]
+
+    assert names
+    assert [name for name in names if name not in settings.QUERY_BUDGETS] == []
+
+
+@pytest.mark.django_db
+@pytest.mark.query_budget(retrieve_all_loans=1)
+def test_overrun_fails_with_the_offending_sql(auth_client, user):
+    with pytest.raises(QueryBudgetExceeded) as exc_info:
+        auth_client.get(f"/loan/retrieve-all-loans/{user.id}/")
+
+    message = str(exc_info.value)
+    assert "over its budget of 1" in message
+    assert 'FROM "loan_loanapplication"' in message
+    # Project frames that ran the query; library frames are left out
+    assert "loan/views.py" in message
+    assert "site-packages" not in message
+
+
+@pytest.mark.django_db
+@pytest.mark.query_budget(retrieve_all_loans=1)
+def test_log_mode_reports_without_failing(auth_client, user, settings, monkeypatch):
+    settings.QUERY_BUDGET_ACTION = "log"
+    logged = []
+    monkeypatch.setattr(query_budget.logger, "error", logged.append)
+
+    response = auth_client.get(f"/loan/retrieve-all-loans/{user.id}/")
+
+    assert response.status_code == 200
+    assert int(response["X-Query-Count"]) > 1
+    assert len(logged) == 1 and "retrieve_all_loans" in logged[0]
+
+
+@pytest.mark.django_db
+def test_enforcement_can_be_switched_off(auth_client, user, settings):
+    settings.QUERY_BUDGET_ENFORCE = False
+    settings.QUERY_BUDGETS = {**settings.QUERY_BUDGETS, "retrieve_all_loans": 0}
+
+    response = auth_client.get(f"/loan/retrieve-all-loans/{user.id}/")
+
+    assert response.status_code == 200
+    assert "X-Query-Count" not in response
+
@@ -0,0 +1,60 @@
+import pytest
+from datetime import timedelta
+from django.core.management import call_command
+from django.utils import timezone
+
+from loan.models import LoanApplication, FraudFlag, PendingFraudAlert
+
+
+@pytest.fixture
+def history(user):
+    """
+    Three loans within 24 hours, one old loan, and one over-limit amount.
+    """
+    now = timezone.now()
+    loans = LoanApplication.objects.bulk_create([
+        LoanApplication(user=user, amount_requested=amount, purpose="Rent")
+        for amount in (1_000, 2_000, 3_000, 4_000, 6_000_000)
+    ])
+    offsets = [timedelta(days=3), timedelta(hours=5), timedelta(hours=4), timedelta(hours=3), timedelta(days=10)]
+    for loan, offset in zip(loans, offsets):
+        LoanApplication.objects.filter(pk=loan.pk).update(date_applied=now - offset)
+    return loans
+
+
+@pytest.mark.django_db
+def test_rescore_flags_loans_under_new_thresholds(history, settings):
+    settings.LOAN_FRAUD_VELOCITY_LIMIT = 2
+
+    call_command("rescore_loans", "--chunk-size", "2")
+
+    statuses = dict(LoanApplication.objects.values_list("id", "status"))
+    assert [statuses[loan.id] for loan in history] == ["pending", "pending", "flagged", "flagged", "flagged"]
+    assert FraudFlag.objects.filter(loan_application=history[4], reason__contains="₦5,000,000").exists()
+    # Re-scoring never sends alert emails
+    assert not PendingFraudAlert.objects.exists()
+
+
+@pytest.mark.django_db
+def test_rescore_clears_flags_that_no_longer_apply(history, settings):
+    FraudFlag.objects.create(loan_application=history[0], reason="Old rule")
+    LoanApplication.objects.filter(pk=history[0].pk).update(status="flagged")
+
+    call_command("rescore_loans")
+
+    history[0].refresh_from_db()
+    assert history[0].status == "pending"
+    assert not history[0].fraud_flags.exists()
+
+
+@pytest.mark.django_db
+def test_rescore_dry_run_and_since(history, settings, capsys):
+    settings.LOAN_FRAUD_VELOCITY_LIMIT = 2
+
+    call_command("rescore_loans", "--dry-run")
+    assert not LoanApplication.objects.filter(status="flagged").exists()
+    assert "3 changed" in capsys.readouterr().out
+
+    since = (timezone.now() - timedelta(days=1)).isoformat()
+    call_command("rescore_loans", "--since", since)
+    assert LoanApplication.objects.filter(status="flagged").count() == 2
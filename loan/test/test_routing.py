@@ -0,0 +1,76 @@
+import sqlite3
+import pytest
+from django.core.management import call_command
+
+from account.models import User
+from loan.fraud import FEATURE_LOADERS, FraudContext, FraudEngine
+from loan.models import LoanApplication
+from quickcheck.routers import PrimaryReplicaRouter, reset_request_state, set_request_user, use_primary
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ["replica_1"]
+    reset_request_state()
+    yield
+    reset_request_state()
+
+
+def new_request(user_id=None):
+    reset_request_state()
+    if user_id:
+        set_request_user(user_id)
+
+
+def test_reads_go_to_the_replica_until_the_request_writes(replicas):
+    assert LoanApplication.objects.all().db == "replica_1"
+
+    assert PrimaryReplicaRouter().db_for_write(LoanApplication) == "default"
+    assert LoanApplication.objects.all().db == "default"
+
+
+def test_recent_writer_reads_from_the_primary_on_the_next_request(replicas):
+    new_request("writer")
+    PrimaryReplicaRouter().db_for_write(LoanApplication)
+
+    new_request("writer")
+    assert LoanApplication.objects.all().db == "default"
+
+    new_request("someone-else")
+    assert LoanApplication.objects.all().db == "replica_1"
+
+
+def test_fraud_features_are_read_from_the_primary(replicas, monkeypatch):
+    seen = []
+    monkeypatch.setitem(
+        FEATURE_LOADERS, "recent_loans", lambda context: seen.append(LoanApplication.objects.all().db) or 0
+    )
+
+    FraudEngine(rule_names=["velocity"]).evaluate(FraudContext(User(email="a@b.com"), 100))
+
+    assert seen == ["default"]
+    assert LoanApplication.objects.all().db == "replica_1"
+    with use_primary():
+        assert LoanApplication.objects.all().db == "default"
+
+
+def test_without_replicas_everything_uses_default(settings):
+    settings.DATABASE_REPLICAS = []
+    assert LoanApplication.objects.all().db == "default"
+
+
+def test_sync_replicas_copies_the_primary_file(settings, tmp_path):
+    primary, replica = tmp_path / "primary.sqlite3", tmp_path / "replica.sqlite3"
+    with sqlite3.connect(primary) as db:
+        db.execute("CREATE TABLE loan (id INTEGER PRIMARY KEY, status TEXT)")
+        db.execute("INSERT INTO loan (status) VALUES ('pending')")
+
+    settings.DATABASES = {
+        "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": primary},
+        "replica_1": {"ENGINE": "django.db.backends.sqlite3", "NAME": replica},
+    }
+    settings.DATABASE_REPLICAS = ["replica_1"]
+    call_command("sync_replicas")
+
+    with sqlite3.connect(replica) as db:
+        assert db.execute("SELECT status FROM loan").fetchall() == [("pending",)]
@@ -0,0 +1,59 @@
+import threading
+import time
+import pytest
+import logging
+from django.db import OperationalError, connection
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+
+from loan.models import LoanApplication
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_submissions_never_hit_lock_errors(settings, loan_payload):
+    """
+    16 threads, each with its own connection and user, submitting 25 loans
+    apiece against the SQLite file. Every insert must succeed.
+    """
+    if settings.SQLITE_PROFILE != 'concurrent':
+        pytest.skip("Needs the concurrent SQLite profile")
+
+    threads, per_thread = 16, 25
+    users = [
+        User.objects.create_user(email=f"load{i}@quickcheck{i}.com", first_name="Load", last_name=str(i))
+        for i in range(threads)
+    ]
+    statuses, lock_errors = [], []
+
+    def submit(user):
+        client = APIClient()
+        client.force_authenticate(user)
+        try:
+            for _ in range(per_thread):
+                try:
+                    statuses.append(client.post(f"/loan/loan-request/{user.id}/", data=loan_payload, format="json").status_code)
+                except OperationalError as exc:
+                    lock_errors.append(str(exc))
+        finally:
+            connection.close()
+
+    workers = [threading.Thread(target=submit, args=(user,)) for user in users]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    total = threads * per_thread
+    logger.info(
+        "%s threads x %s loans: %.0f inserts/s, %s lock error(s)",
+        threads, per_thread, total / elapsed, len(lock_errors),
+    )
+    assert lock_errors == []
+    assert statuses == [201] * total
+    assert LoanApplication.objects.count() == total
@@ -0,0 +1,149 @@
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.test import Client
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from loan.models import LoanApplication, LoanDailyStat
+from loan.utils import bulk_update_status
+
+User = get_user_model()
+
+URL = "/loan/admin/stats/"
+
+
+@pytest.fixture
+def admin_user(db):
+    return User.objects.create_superuser(
+        email="admin@quickcheck.com", first_name="Ada", last_name="Admin", password="Adminseries1@"
+    )
+
+
+@pytest.fixture
+def admin_client(admin_user):
+    client = APIClient()
+    client.force_authenticate(admin_user)
+    return client
+
+
+def rollup():
+    return {
+        (stat.day, stat.status): (stat.loan_count, stat.total_amount)
+        for stat in LoanDailyStat.objects.all()
+        if stat.loan_count
+    }
+
+
+def full_aggregate():
+    rows = (
+        LoanApplication.objects.annotate(day=TruncDate("date_applied"))
+        .values("day", "status")
+        .annotate(loans=Count("id"), amount=Sum("amount_requested"))
+        .order_by()
+    )
+    return {(row["day"], row["status"]): (row["loans"], row["amount"]) for row in rows}
+
+
+@pytest.mark.django_db
+def test_rollup_follows_submissions_and_status_changes(auth_client, user, admin_client):
+    auth_client.post(f"/loan/loan-request/{user.id}/", data={"amount_requested": "50000.00", "purpose": "Stock"}, format="json")
+    auth_client.post(
+        f"/loan/loan-request/{user.id}/bulk/",
+        data=[{"amount_requested": "1000.00", "purpose": "Rent"}, {"amount_requested": "6000000.00", "purpose": "Land"}],
+        format="json",
+    )
+    assert rollup() == full_aggregate()
+
+    loan = LoanApplication.objects.order_by("id").first()
+    admin_client.patch(f"/loan/admin/loan/{loan.id}/", data={"status": "approved"}, format="json")
+    assert rollup() == full_aggregate()
+
+    bulk_update_status(LoanApplication.objects.all(), "rejected")
+    assert rollup() == full_aggregate()
+
+    LoanApplication.objects.get(pk=loan.pk).delete()
+    assert rollup() == full_aggregate()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("loaded", [("status",), ("id",)])
+def test_rollup_follows_status_changes_on_deferred_instances(user, loaded):
+    loan = LoanApplication.objects.create(user=user, amount_requested=1000, purpose="Rent")
+
+    loan = LoanApplication.objects.only(*loaded).get(pk=loan.pk)
+    loan.status = "approved"
+    loan.save()
+
+    assert rollup() == full_aggregate()
+
+
+@pytest.mark.django_db
+def test_failed_rollup_update_rolls_back_the_status_change(user, monkeypatch):
+    loan = LoanApplication.objects.create(user=user, amount_requested=1000, purpose="Rent")
+
+    def fail(*args):
+        raise RuntimeError("upsert failed")
+
+    monkeypatch.setattr("loan.signals.record_change", fail)
+    loan.status = "approved"
+    with pytest.raises(RuntimeError):
+        loan.save()
+
+    assert LoanApplication.objects.get(pk=loan.pk).status == "pending"
+
+
+@pytest.mark.django_db
+def test_rescore_keeps_rollup_in_step(user):
+    now = timezone.now()
+    loans = LoanApplication.objects.bulk_create([
+        LoanApplication(user=user, amount_requested=amount, purpose="Rent")
+        for amount in (1_000, 2_000, 6_000_000)
+    ])
+    LoanApplication.objects.filter(pk=loans[0].pk).update(date_applied=now - timedelta(days=3))
+    call_command("rebuild_loan_stats")
+    assert rollup() == full_aggregate()
+
+    call_command("rescore_loans")
+
+    # the over-cap loan moves from pending to flagged
+    assert LoanApplication.objects.get(pk=loans[2].pk).status == "flagged"
+    assert rollup() == full_aggregate()
+
+
+@pytest.mark.django_db
+def test_stats_endpoint_reads_the_rollup(admin_client, user, django_assert_max_num_queries):
+    LoanApplication.objects.create(user=user, amount_requested=Decimal("1500.50"), purpose="Rent")
+    LoanApplication.objects.create(user=user, amount_requested=Decimal("500.00"), purpose="Rent", status="flagged")
+
+    with django_assert_max_num_queries(1):
+        response = admin_client.get(URL, {"days": 7})
+
+    assert response.status_code == 200
+    assert response.data["totals"]["pending"] == {"count": 1, "amount": "1500.50"}
+    assert response.data["totals"]["flagged"] == {"count": 1, "amount": "500.00"}
+    assert response.data["daily"][0]["day"] == timezone.localdate().isoformat()
+
+
+@pytest.mark.django_db
+def test_stats_endpoint_requires_admin_and_valid_days(auth_client, admin_client):
+    assert auth_client.get(URL).status_code == 403
+    assert admin_client.get(URL, {"days": "week"}).status_code == 400
+    assert admin_client.get(URL, {"days": 1000}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_admin_dashboard_shows_loan_stats(admin_user, user):
+    LoanApplication.objects.create(user=user, amount_requested=2500, purpose="Rent")
+    client = Client()
+    client.force_login(admin_user)
+
+    response = client.get("/admin/")
+
+    assert response.status_code == 200
+    assert response.context["loan_stats"]["totals"]["pending"]["count"] == 1
+    assert b"Loan applications since" in response.content
@@ -0,0 +1,86 @@
+import pytest
+from types import SimpleNamespace
+from django.db import connection
+
+from loan.models import LoanApplication, PendingFraudAlert
+from loan.serializers import LoanRequestSerializer
+from loan.velocity import recent_submission_count
+
+WRITES = ("INSERT", "UPDATE", "DELETE")
+
+
+class StatementLog:
+    """
+    Records every statement and whether it ran inside a transaction.
+    """
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.statements.append((sql, connection.in_atomic_block))
+        return execute(sql, params, many, context)
+
+    @property
+    def writes(self):
+        return [(sql, atomic) for sql, atomic in self.statements if sql.lstrip().upper().startswith(WRITES)]
+
+
+def submit(client, user, amount, monkeypatch):
+    commits = []
+    original_commit = connection._commit
+    monkeypatch.setattr(connection, "_commit", lambda: commits.append(1) or original_commit())
+
+    log = StatementLog()
+    with connection.execute_wrapper(log):
+        response = client.post(
+            f"/loan/loan-request/{user.id}/",
+            data={"amount_requested": amount, "purpose": "Stock"},
+            format="json",
+        )
+    return response, log, commits
+
+
+@pytest.mark.django_db(transaction=True)
+def test_unflagged_submission_is_one_transaction(auth_client, user, monkeypatch):
+    response, log, commits = submit(auth_client, user, "50000.00", monkeypatch)
+
+    assert response.data["detail"] == "Loan submitted successfully."
+    assert len(commits) == 1
+    assert all(atomic for sql, atomic in log.writes)
+    # velocity bucket (update + first-time insert), the loan itself and the
+    # LoanDailyStat upsert
+    assert len(log.writes) == 4
+    # 2 user lookups, BEGIN, bucket update/savepoint/insert/release, window
+    # sum + edge count, domain count, loan insert, stats upsert
+    assert len(log.statements) <= 12
+    assert LoanApplication.objects.get().status == "pending"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_flagged_submission_writes_loan_once_and_flags_in_bulk(auth_client, user, monkeypatch):
+    response, log, commits = submit(auth_client, user, "10000000.00", monkeypatch)
+
+    assert response.data["detail"] == "Loan submitted and flagged for review."
+    assert len(commits) == 1
+    assert all(atomic for sql, atomic in log.writes)
+
+    loan_writes = [sql for sql, atomic in log.writes if '"loan_loanapplication"' in sql.split("(")[0]]
+    flag_writes = [sql for sql, atomic in log.writes if '"loan_fraudflag"' in sql.split("(")[0]]
+    assert len(loan_writes) == 1 and loan_writes[0].startswith("INSERT")
+    assert len(flag_writes) == 1
+    assert LoanApplication.objects.get().status == "flagged"
+    assert PendingFraudAlert.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_serializer_save_goes_through_submit_loan(user):
+    serializer = LoanRequestSerializer(
+        data={"amount_requested": "10000000.00", "purpose": "Warehouse"},
+        context={"request": SimpleNamespace(user=user)},
+    )
+    assert serializer.is_valid()
+
+    loan = serializer.save()
+
+    assert loan.status == "flagged"
+    assert recent_submission_count(user) == 1
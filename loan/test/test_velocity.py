@@ -0,0 +1,39 @@
+import pytest
+from datetime import datetime, timezone as dt_timezone
+
+from loan.models import LoanApplication, LoanVelocityBucket
+from loan.velocity import recent_submission_count
+
+
+@pytest.mark.django_db
+def test_third_submission_in_24_hours_is_flagged(auth_client, user, loan_payload):
+    url = f"/loan/loan-request/{user.id}/"
+
+    for _ in range(2):
+        response = auth_client.post(url, data=loan_payload, format="json")
+        assert response.data["detail"] == "Loan submitted successfully."
+
+    response = auth_client.post(url, data=loan_payload, format="json")
+
+    assert response.data["detail"] == "Loan submitted and flagged for review."
+    assert any("last 24 hours" in reason for reason in response.data["reasons"])
+    assert sum(LoanVelocityBucket.objects.filter(user=user).values_list("count", flat=True)) == 3
+
+
+@pytest.mark.django_db
+def test_recent_submission_count_is_exact_at_window_edge(user):
+    now = datetime(2026, 1, 2, 12, 30, tzinfo=dt_timezone.utc)
+
+    # Oldest hour is only half inside the window: one loan before, one after 12:30
+    LoanVelocityBucket.objects.create(user=user, hour=datetime(2026, 1, 1, 12, tzinfo=dt_timezone.utc), count=2)
+    for minute in (15, 45):
+        loan = LoanApplication.objects.create(user=user, amount_requested=100, purpose="Rent")
+        LoanApplication.objects.filter(pk=loan.pk).update(
+            date_applied=datetime(2026, 1, 1, 12, minute, tzinfo=dt_timezone.utc)
+        )
+
+    LoanVelocityBucket.objects.create(user=user, hour=datetime(2026, 1, 1, 20, tzinfo=dt_timezone.utc), count=3)
+    LoanVelocityBucket.objects.create(user=user, hour=datetime(2026, 1, 2, 12, tzinfo=dt_timezone.utc), count=1)
+    LoanVelocityBucket.objects.create(user=user, hour=datetime(2025, 12, 31, 9, tzinfo=dt_timezone.utc), count=7)
+
+    assert recent_submission_count(user, now) == 5
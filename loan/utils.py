@@ -1,8 +1,13 @@
-from datetime import timedelta
 from django.utils import timezone
+from django.db import transaction
 from django.db.models import Count
 from django.contrib.auth import get_user_model
-from .models import LoanApplication, FraudFlag
+from account.models import EmailDomainCount
+from .models import LoanApplication, FraudFlag, FraudCheckJob, LoanDailyStat
+from .notifications import queue_fraud_alerts
+from .stats import record_created, status_change_deltas
+from .fraud import FraudContext, FraudEngine
+from .velocity import record_submission, recent_submission_count
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,50 +15,121 @@ logger = logging.getLogger(__name__)
 User = get_user_model()
 
 
-def check_fraud_conditions(user, amount_requested):
+def check_fraud_conditions(user, amount_requested, recent_loans=None, domain_count=None):
     """
     Evaluates multiple fraud criteria for a given loan request.
     Returns a list of reasons if any suspicious activity is detected.
-    """
-    now = timezone.now()
-    reasons = []
+    A velocity count captured at submission time can be passed as `recent_loans`,
+    and callers checking many loans at once can pass a precomputed `domain_count`.
 
+    Kept for compatibility; the rules themselves live in loan.fraud.
+    """
+    context = FraudContext(user, amount_requested, recent_loans=recent_loans, domain_count=domain_count)
+    return FraudEngine().evaluate(context).reasons
 
-    # Condition 1: More than 3 loans submitted by the user in the past 24 hours
-    recent_loans = LoanApplication.objects.filter(
-        user=user,
-        date_applied__gte=now - timedelta(hours=24)
-    ).count()
-    if recent_loans >= 3:
-        reasons.append("More than 3 loans submitted in the last 24 hours.")
-        logger.warning(f"Fraud alert for user {user.email}: {recent_loans} loans in 24 hours.")
 
+def flag_loan(loan, reasons):
+    """
+    Flags a loan application as suspicious and creates corresponding FraudFlag entries.
+    Status, flags and the pending alert are written with one statement each.
+    """
+    loan.status = 'flagged'
+    loan.save(update_fields=['status', 'date_updated'])
 
-    # Condition 2: Loan amount exceeds ₦5,000,000
-    if amount_requested > 5_000_000:
-        reasons.append("Requested amount exceeds ₦5,000,000.")
-        logger.warning(f"Fraud alert for user {user.email}: requested ₦{amount_requested:,}.")
+    FraudFlag.objects.bulk_create([FraudFlag(loan_application=loan, reason=reason) for reason in reasons])
+    queue_fraud_alerts([loan.id])
 
+    logger.info("Loan #%s marked as 'flagged' with %s fraud reason(s).", loan.id, len(reasons), extra={'loan_id': loan.id})
 
-    # Condition 3: Email domain shared by more than 10 users
-    domain = user.email.split('@')[-1]
-    same_domain_count = User.objects.filter(email__iendswith=f"@{domain}").distinct().count()
-    if same_domain_count > 10:
-        reasons.append(f"Email domain '{domain}' is used by more than 10 users.")
-        logger.warning(f"Fraud alert: domain '{domain}' used by {same_domain_count} users.")
 
+def evaluate_loan(loan, recent_loans=None):
+    """
+    Runs the fraud checks for a saved loan and flags it if suspicious.
+    Returns the list of reasons (empty when the loan is clean).
+    """
+    reasons = check_fraud_conditions(loan.user, loan.amount_requested, recent_loans=recent_loans)
+    if reasons:
+        flag_loan(loan, reasons)
     return reasons
 
 
-def flag_loan(loan, reasons):
+def submit_loan(user, data, evaluate=True):
     """
-    Flags a loan application as suspicious and creates corresponding FraudFlag entries.
+    Submits a single loan; see submit_loan_batch. Returns (loan, reasons).
     """
-    loan.status = 'flagged'
-    loan.save()
+    return submit_loan_batch(user, [data], evaluate=evaluate)[0]
 
-    for reason in reasons:
-        FraudFlag.objects.create(loan_application=loan, reason=reason)
-        logger.info(f"Loan #{loan.id} flagged: {reason}")
 
-    logger.info(f"Loan #{loan.id} marked as 'flagged' with {len(reasons)} fraud reason(s).")
+def submit_loan_batch(user, items, evaluate=True):
+    """
+    Inserts several loan applications for one user and returns a list of
+    (loan, reasons) pairs in input order.
+
+    Fraud rules run before the insert, so each loan is written once with its
+    final status. The velocity counter is bumped once for the whole batch and
+    the domain count is read once; item N is judged as if the batch's earlier
+    items had been submitted just before it. With `evaluate=False` the loans
+    are stored as pending and queued for the fraud worker instead. Must run
+    inside a transaction, which also holds the pending fraud alerts.
+    """
+    now = timezone.now()
+    record_submission(user, now, count=len(items))
+    previous = recent_submission_count(user, now) - len(items)
+
+    loans = []
+    results = []
+    if evaluate:
+        engine = FraudEngine()
+        domain_count = EmailDomainCount.get_user_count(user.email_domain)
+
+    for position, item in enumerate(items, start=1):
+        item = {key: value for key, value in item.items() if key != 'status'}
+        reasons = []
+        if evaluate:
+            context = FraudContext(
+                user, item['amount_requested'], now,
+                recent_loans=previous + position,
+                domain_count=domain_count,
+            )
+            reasons = engine.evaluate(context).reasons
+        loan = LoanApplication(user=user, status='flagged' if reasons else 'pending', **item)
+        loans.append(loan)
+        results.append((loan, reasons))
+
+    LoanApplication.objects.bulk_create(loans)
+    record_created(loans)
+
+    if evaluate:
+        FraudFlag.objects.bulk_create([
+            FraudFlag(loan_application=loan, reason=reason)
+            for loan, reasons in results
+            for reason in reasons
+        ])
+        flagged_ids = [loan.id for loan, reasons in results if reasons]
+        if flagged_ids:
+            queue_fraud_alerts(flagged_ids)
+            logger.info("Batch of %s loan(s) by %s: %s flagged.", len(loans), user.email, len(flagged_ids))
+    else:
+        FraudCheckJob.objects.bulk_create([
+            FraudCheckJob(loan_application=loan, recent_loans=previous + position)
+            for position, loan in enumerate(loans, start=1)
+        ])
+
+    return results
+
+
+def bulk_update_status(queryset, target_status):
+    """
+    Moves every loan in `queryset` whose current status allows it to
+    `target_status` with a single UPDATE. Loans in any other status are left
+    untouched. LoanDailyStat is adjusted in the same transaction. Returns the
+    number of rows changed.
+    """
+    allowed = LoanApplication.ALLOWED_TRANSITIONS[target_status]
+    movable = queryset.filter(status__in=allowed)
+    with transaction.atomic(savepoint=False):
+        deltas = status_change_deltas(movable, target_status)
+        updated = movable.update(status=target_status, date_updated=timezone.now())
+        LoanDailyStat.apply(deltas)
+    logger.info("Bulk status update to '%s': %s loan(s) changed.", target_status, updated)
+    return updated
@@ -0,0 +1,66 @@
+from datetime import timedelta
+from django.db import transaction, IntegrityError
+from django.db.models import F, Sum
+from django.utils import timezone
+from .models import LoanApplication, LoanVelocityBucket
+
+
+VELOCITY_WINDOW = timedelta(hours=24)
+BUCKET_SIZE = timedelta(hours=1)
+
+
+def bucket_start(moment):
+    """
+    Truncates a datetime to the start of its hourly bucket.
+    """
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def record_submission(user, when=None, count=1):
+    """
+    Counts `count` loan submissions in the user's hourly bucket.
+    Call it inside the transaction that inserts the loans so the counter
+    and the loan rows commit (or roll back) together.
+    """
+    hour = bucket_start(when or timezone.now())
+
+    updated = LoanVelocityBucket.objects.filter(user=user, hour=hour).update(count=F('count') + count)
+    if updated:
+        return
+
+    try:
+        with transaction.atomic():
+            LoanVelocityBucket.objects.create(user=user, hour=hour, count=count)
+    except IntegrityError:
+        # A concurrent submission created the bucket first
+        LoanVelocityBucket.objects.filter(user=user, hour=hour).update(count=F('count') + count)
+
+
+def recent_submission_count(user, now=None):
+    """
+    Returns how many loans the user submitted in the 24 hours before ``now``.
+    Whole hours are read from at most 24 buckets; only the oldest, partially
+    covered hour is counted from LoanApplication, which is bounded by the
+    (user, date_applied) index.
+    """
+    now = now or timezone.now()
+    window_start = now - VELOCITY_WINDOW
+
+    first_full_hour = bucket_start(window_start)
+    if first_full_hour < window_start:
+        first_full_hour += BUCKET_SIZE
+
+    total = LoanVelocityBucket.objects.filter(
+        user=user,
+        hour__gte=first_full_hour,
+        hour__lte=now,
+    ).aggregate(total=Sum('count'))['total'] or 0
+
+    if first_full_hour > window_start:
+        total += LoanApplication.objects.filter(
+            user=user,
+            date_applied__gte=window_start,
+            date_applied__lt=first_full_hour,
+        ).count()
+
+    return total
@@ -1,77 +1,141 @@
 from django.shortcuts import get_object_or_404
+from django.db import transaction
+from django.conf import settings
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
-from rest_framework.pagination import LimitOffsetPagination
-from .serializers import LoanRequestSerializer
+from .serializers import LoanRequestSerializer, BulkStatusUpdateSerializer, FastLoanListSerializer, loan_list_rows
+from .pagination import get_loan_paginator
 from .models import LoanApplication
-from .utils import check_fraud_conditions, flag_loan
+from .utils import submit_loan, submit_loan_batch, bulk_update_status
+from .stats import loan_stats
+from quickcheck.metrics import timed_serialization
 from django.contrib.auth import get_user_model
 import logging
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
+# Window accepted by loan_stats_view's `days` parameter
+LOAN_STATS_DEFAULT_DAYS = 30
+LOAN_STATS_MAX_DAYS = 366
+
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def loan_request(request, user_id):
     """
     Allows an authenticated user to apply for a loan.
-    Performs fraud checks and flags the loan if suspicious.
+    Fraud checks are queued for the fraud worker, or run inline and flag the
+    loan if suspicious when LOAN_FRAUD_CHECK_MODE is 'sync'.
     """
-    user = get_object_or_404(User, id=user_id)
-
-    if request.user != user:
-        logger.warning(f"Unauthorized loan attempt by {request.user.email} on behalf of user ID {user_id}")
+    # The URL id is compared with the authenticated user; no lookup needed
+    if request.user.id != user_id:
+        logger.warning("Unauthorized loan attempt by %s on behalf of user ID %s", request.user.email, user_id)
         return Response({"detail": "You can only apply for a loan on your own behalf."},
                         status=status.HTTP_403_FORBIDDEN)
 
+    user = request.user
     serializer = LoanRequestSerializer(data=request.data, context={'request': request})
     
     if serializer.is_valid():
-        loan = serializer.save()
+        run_inline = settings.LOAN_FRAUD_CHECK_MODE == 'sync'
+
+        # Velocity bump, fraud evaluation, loan insert (with its final status),
+        # flags and the pending alert all commit together
+        with transaction.atomic():
+            loan, reasons = submit_loan(user, serializer.validated_data, evaluate=run_inline)
+
+        if not run_inline:
+            logger.info("Loan #%s submitted by %s and queued for fraud review", loan.id, user.email, extra={'loan_id': loan.id})
+            return Response({
+                "detail": "Loan submitted successfully.",
+                "loan_id": loan.id,
+                "status": loan.status,
+            }, status=status.HTTP_201_CREATED)
 
-        # Run fraud detection
-        reasons = check_fraud_conditions(user, loan.amount_requested)
         if reasons:
-            flag_loan(loan, reasons)
-            logger.warning(f"Loan #{loan.id} by {user.email} flagged for: {reasons}")
+            logger.warning("Loan #%s by %s flagged for: %s", loan.id, user.email, reasons, extra={'loan_id': loan.id})
             return Response({
                 "detail": "Loan submitted and flagged for review.",
                 "reasons": reasons
             }, status=status.HTTP_201_CREATED)
 
-        logger.info(f"Loan #{loan.id} submitted successfully by {user.email}")
+        logger.info("Loan #%s submitted successfully by %s", loan.id, user.email, extra={'loan_id': loan.id})
         return Response({"detail": "Loan submitted successfully."}, status=status.HTTP_201_CREATED)
 
-    logger.error(f"Loan submission failed for {user.email}: {serializer.errors}")
+    logger.error("Loan submission failed for %s: %s", user.email, serializer.errors)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_loan_request(request, user_id):
+    """
+    Allows an authenticated user (e.g. a partner channel) to submit several
+    loan applications in one call. Fraud lookups run once for the whole batch
+    and the response reports the outcome of every item, in input order.
+    """
+    if request.user.id != user_id:
+        logger.warning("Unauthorized bulk loan attempt by %s on behalf of user ID %s", request.user.email, user_id)
+        return Response({"detail": "You can only apply for a loan on your own behalf."},
+                        status=status.HTTP_403_FORBIDDEN)
+
+    user = request.user
+
+    serializer = LoanRequestSerializer(
+        data=request.data,
+        many=True,
+        allow_empty=False,
+        max_length=settings.LOAN_BULK_MAX_ITEMS,
+        context={'request': request},
+    )
+
+    if not serializer.is_valid():
+        logger.error("Bulk loan submission failed for %s: %s", user.email, serializer.errors)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    run_inline = settings.LOAN_FRAUD_CHECK_MODE == 'sync'
+    with transaction.atomic():
+        results = submit_loan_batch(user, serializer.validated_data, evaluate=run_inline)
+
+    logger.info("%s submitted %s loan(s) in bulk", user.email, len(results))
+    return Response({
+        "detail": f"{len(results)} loan(s) submitted.",
+        "results": [
+            {"loan_id": loan.id, "status": loan.status, "reasons": reasons}
+            for loan, reasons in results
+        ],
+    }, status=status.HTTP_201_CREATED)
+
+
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def retrieve_all_loans(request, user_id):
     """
     Retrieves all loan applications submitted by the authenticated user.
+    Pass `pagination=cursor` (and then the returned `next` cursor) for keyset pagination.
     """
-    user = get_object_or_404(User, id=user_id)
-
-    if request.user != user:
-        logger.warning(f"Unauthorized loan access attempt by {request.user.email} for user ID {user_id}")
+    if request.user.id != user_id:
+        logger.warning("Unauthorized loan access attempt by %s for user ID %s", request.user.email, user_id)
         return Response({"detail": "You can only view your own loans."},
                         status=status.HTTP_403_FORBIDDEN)
 
-    loans = LoanApplication.objects.filter(user=user).order_by('-date_applied')
-    paginator = LimitOffsetPagination()
+    user = request.user
+
+    loans = loan_list_rows(LoanApplication.objects.filter(user=user).order_by('-date_applied', '-id'))
+    paginator = get_loan_paginator(request)
     paginated_loans = paginator.paginate_queryset(loans, request)
-    serializer = LoanRequestSerializer(paginated_loans, many=True)
+    with timed_serialization():
+        data = FastLoanListSerializer(paginated_loans).data
 
-    logger.info(f"{request.user.email} retrieved their loan history")
-    return paginator.get_paginated_response(serializer.data)
+    logger.info("%s retrieved their loan history", request.user.email)
+    return paginator.get_paginated_response(data)
 
 
 
@@ -89,7 +153,7 @@ def update_loan_status(request, loan_id):
     serializer.is_valid(raise_exception=True)
     serializer.save()
 
-    logger.info(f"Admin {request.user.email} updated Loan #{loan.id} to '{loan.status}'")
+    logger.info("Admin %s updated Loan #%s to '%s'", request.user.email, loan.id, loan.status, extra={'loan_id': loan.id})
     return Response(
         {"detail": f"Loan #{loan.id} status successfully updated to '{loan.status}'"},
         status=status.HTTP_200_OK
@@ -98,24 +162,71 @@ def update_loan_status(request, loan_id):
 
 
 
+@api_view(['PATCH'])
+@permission_classes([IsAdminUser])
+def bulk_update_loan_status(request):
+    """
+    Allows admin to move many loans to a new status with one UPDATE.
+    Loans whose current status does not allow the transition are skipped.
+    """
+    serializer = BulkStatusUpdateSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+
+    target = serializer.validated_data['status']
+    updated = bulk_update_status(serializer.get_queryset(), target)
+
+    response = {
+        "detail": f"{updated} loan(s) updated to '{target}'.",
+        "updated": updated,
+    }
+    if 'ids' in serializer.validated_data:
+        response["skipped"] = len(set(serializer.validated_data['ids'])) - updated
+
+    logger.info("Admin %s bulk updated %s loan(s) to '%s'", request.user.email, updated, target)
+    return Response(response, status=status.HTTP_200_OK)
+
+
+
+
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
 def flagged_loans(request):
     """
     Retrieves all loan applications that have been flagged for fraud review.
+    Pass `pagination=cursor` (and then the returned `next` cursor) for keyset pagination.
     """
-    loans = LoanApplication.objects.filter(status='flagged').order_by('-date_applied')
+    loans = loan_list_rows(LoanApplication.objects.filter(status='flagged').order_by('-date_applied', '-id'))
+
+    paginator = get_loan_paginator(request)
+    paginated_loans = paginator.paginate_queryset(loans, request)
 
-    if not loans.exists():
+    # An empty first page means the queue is empty; no separate exists() query needed
+    if not paginated_loans and paginator.is_first_page():
         logger.info("Admin requested flagged loans: none found.")
         return Response(
             {"detail": "No flagged loan applications at this time."},
             status=status.HTTP_200_OK
         )
 
-    paginator = LimitOffsetPagination()
-    paginated_loans = paginator.paginate_queryset(loans, request)
-    serializer = LoanRequestSerializer(paginated_loans, many=True)
+    with timed_serialization():
+        data = FastLoanListSerializer(paginated_loans).data
+
+    logger.info("Admin %s retrieved %s flagged loan(s).", request.user.email, len(paginated_loans))
+    return paginator.get_paginated_response(data)
 
-    logger.info(f"Admin {request.user.email} retrieved {len(paginated_loans)} flagged loan(s).")
-    return paginator.get_paginated_response(serializer.data)
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def loan_stats_view(request):
+    """
+    Loan counts and amounts per status for the last `days` days (default 30),
+    with a per-day breakdown. Reads the LoanDailyStat rollup only.
+    """
+    try:
+        days = int(request.query_params.get('days', LOAN_STATS_DEFAULT_DAYS))
+    except ValueError:
+        return Response({"days": ["A whole number is required."]}, status=status.HTTP_400_BAD_REQUEST)
+    if not 1 <= days <= LOAN_STATS_MAX_DAYS:
+        return Response({"days": [f"Must be between 1 and {LOAN_STATS_MAX_DAYS}."]}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(loan_stats(days))
@@ -0,0 +1,9 @@
+from django.urls import path, include
+
+from .urls import urlpatterns as wsgi_urlpatterns
+
+# URLconf for requests served through quickcheck/asgi.py
+urlpatterns = [
+    path('account/', include('account.async_urls')),
+    path('loan/', include('loan.async_urls')),
+] + wsgi_urlpatterns
@@ -0,0 +1,46 @@
+"""
+Helpers shared by the native async views (account/async_views.py and
+loan/async_views.py) so their errors, parsing and method checks match the
+DRF views they stand in for.
+"""
+from django.http import JsonResponse
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+
+def error_response(exc, authenticator=None):
+    """
+    Renders an APIException the way DRF's exception handler does.
+    """
+    data = exc.detail if isinstance(exc.detail, (dict, list)) else {'detail': exc.detail}
+    response = JsonResponse(data, status=exc.status_code, safe=False)
+    if authenticator is not None and exc.status_code == status.HTTP_401_UNAUTHORIZED:
+        response['WWW-Authenticate'] = authenticator.authenticate_header(None)
+    return response
+
+
+def check_method(request, *methods):
+    """
+    Raises MethodNotAllowed unless the request uses one of `methods`.
+    """
+    if request.method not in methods:
+        raise exceptions.MethodNotAllowed(request.method)
+
+
+def parse_body(request):
+    """
+    Returns the parsed request body using DRF's configured parsers. Raises
+    APIException for bodies they cannot parse.
+    """
+    parsers = [parser() for parser in api_settings.DEFAULT_PARSER_CLASSES]
+    return Request(request, parsers=parsers).data
+
+
+def parse_post(request):
+    """
+    Returns the parsed body of a POST. Raises APIException for other methods
+    and unparseable bodies.
+    """
+    check_method(request, 'POST')
+    return parse_body(request)
@@ -0,0 +1,99 @@
+import atexit
+import copy
+import json
+import logging
+import queue
+import uuid
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+
+
+# Fields attached to every record logged while handling the current request
+_log_context = ContextVar('log_context', default={})
+
+# Record attributes the JSON formatter always writes (None when unknown)
+CONTEXT_FIELDS = ('request_id', 'user_id', 'loan_id')
+
+
+def bind_log_context(**fields):
+    """
+    Adds fields (e.g. user_id once the request is authenticated) to every
+    record logged for the rest of the request.
+    """
+    _log_context.set({**_log_context.get(), **fields})
+
+
+def start_log_context(request_id=None):
+    """
+    Starts a fresh context for a new request and returns its request id.
+    """
+    request_id = request_id or uuid.uuid4().hex
+    _log_context.set({'request_id': request_id})
+    return request_id
+
+
+class ContextFilter(logging.Filter):
+    """
+    Copies the request's log context onto each record. Attach it to the
+    queue handler so it runs on the calling thread, before the record is
+    queued; values passed through `extra` win.
+    """
+
+    def filter(self, record):
+        for name in CONTEXT_FIELDS:
+            if not hasattr(record, name):
+                setattr(record, name, None)
+        for name, value in _log_context.get().items():
+            if getattr(record, name, None) is None:
+                setattr(record, name, value)
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: time, level, logger, message, the context
+    fields, and the traceback when there is one.
+    """
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for name in CONTEXT_FIELDS:
+            entry[name] = getattr(record, name, None)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc_info'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class QueueListenerHandler(QueueHandler):
+    """
+    Queues records for a background QueueListener that passes them to the
+    real `handlers`, so formatting and stream I/O never happen on the request
+    thread. Configure it after its targets in LOGGING, e.g.
+    `'handlers': ['cfg://handlers.console']`.
+    """
+
+    def __init__(self, handlers, respect_handler_level=True, maxsize=-1):
+        super().__init__(queue.Queue(maxsize))
+        # dictConfig resolves cfg:// references on item access, not on iteration
+        targets = [handlers[index] for index in range(len(handlers))]
+        self.listener = QueueListener(self.queue, *targets, respect_handler_level=respect_handler_level)
+        self.listener.start()
+        atexit.register(self.listener.stop)
+
+    def prepare(self, record):
+        # Merge the arguments now; keep the traceback apart for the formatter
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
@@ -0,0 +1,223 @@
+"""
+In-process request metrics, exposed at /metrics in the Prometheus text
+format (see quickcheck.views.metrics_view).
+
+quickcheck.middleware.metrics_middleware times every request and, through a
+database execute wrapper, its queries. Views add serialization time with
+timed_serialization() and FraudEngine reports every rule it runs. Values are
+kept per process; scrape each worker. METRICS_ENABLED turns it all off.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from rest_framework.renderers import JSONRenderer
+
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Upper bounds of the queries-per-request histogram buckets
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+# Counters of the request being handled, shared with sync_to_async threads
+_current = ContextVar('request_metrics', default=None)
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram for one label set.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+
+
+class MetricsRegistry:
+    """
+    Histograms and counters keyed by metric name and label values. One lock
+    guards every update; an observation is a bisect and two additions.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.help = {}
+        self.buckets = {}
+        self.histograms = {}
+        self.counters = {}
+
+    def histogram(self, name, help_text, buckets=LATENCY_BUCKETS):
+        self.help[name] = help_text
+        self.buckets[name] = buckets
+
+    def counter(self, name, help_text):
+        self.help[name] = help_text
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(self.buckets[name])
+            histogram.observe(value)
+
+    def increment(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def reset(self):
+        with self.lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+    def render(self):
+        """
+        All metrics in the Prometheus text exposition format (0.0.4).
+        """
+        with self.lock:
+            histograms = {key: (list(value.counts), value.total) for key, value in self.histograms.items()}
+            counters = dict(self.counters)
+
+        lines = []
+        for name in sorted({name for name, labels in counters}):
+            lines += [f"# HELP {name} {self.help[name]}", f"# TYPE {name} counter"]
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{name}{format_labels(labels)} {value}")
+
+        for name in sorted({name for name, labels in histograms}):
+            lines += [f"# HELP {name} {self.help[name]}", f"# TYPE {name} histogram"]
+            bounds = [format_value(bound) for bound in self.buckets[name]] + ['+Inf']
+            for (metric, labels), (counts, total) in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(bounds, counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{format_labels(labels + (('le', bound),))} {cumulative}")
+                lines.append(f"{name}_sum{format_labels(labels)} {format_value(total)}")
+                lines.append(f"{name}_count{format_labels(labels)} {cumulative}")
+
+        return "\n".join(lines) + "\n"
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label(value)}"' for name, value in labels) + "}"
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+registry = MetricsRegistry()
+registry.counter('quickcheck_requests_total', "Requests handled, by view and response status.")
+registry.histogram('quickcheck_request_duration_seconds', "Wall time per request, by view.")
+registry.histogram('quickcheck_request_db_queries', "Database queries per request, by view.", QUERY_COUNT_BUCKETS)
+registry.histogram('quickcheck_request_db_seconds', "Time spent in database queries per request, by view.")
+registry.histogram('quickcheck_request_serialization_seconds', "Time spent serializing response data per request, by view.")
+registry.histogram('quickcheck_fraud_rule_seconds', "Time per fraud rule evaluation, by rule.")
+
+
+class RequestMetrics:
+    """
+    Counters for the request being handled.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.serialization_seconds = 0.0
+
+
+def start_request():
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def finish_request(metrics, token, request, response):
+    _current.reset(token)
+    match = getattr(request, 'resolver_match', None)
+    view = match.view_name if match else 'unresolved'
+
+    registry.increment('quickcheck_requests_total', view=view, status=response.status_code)
+    registry.observe('quickcheck_request_duration_seconds', time.perf_counter() - metrics.started, view=view)
+    registry.observe('quickcheck_request_db_queries', metrics.db_queries, view=view)
+    registry.observe('quickcheck_request_db_seconds', metrics.db_seconds, view=view)
+    if metrics.serialization_seconds:
+        registry.observe('quickcheck_request_serialization_seconds', metrics.serialization_seconds, view=view)
+
+
+@contextmanager
+def timed_serialization():
+    """
+    Adds the time spent in the block to the current request's serialization time.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.serialization_seconds += time.perf_counter() - started
+
+
+def observe_fraud_rule(rule_name, seconds):
+    if settings.METRICS_ENABLED:
+        registry.observe('quickcheck_fraud_rule_seconds', seconds, rule=rule_name)
+
+
+def query_timer(execute, sql, params, many, context):
+    """
+    Execute wrapper counting and timing the current request's queries.
+    """
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_queries += 1
+        metrics.db_seconds += time.perf_counter() - started
+
+
+def install_query_timer(connection, **kwargs):
+    if query_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_timer)
+
+
+def install():
+    """
+    Wraps every database connection, open or future, with query_timer.
+    """
+    connection_created.connect(install_query_timer, dispatch_uid='quickcheck_metrics_query_timer')
+    for connection in connections.all(initialized_only=True):
+        install_query_timer(connection)
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that counts rendering towards serialization time.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timed_serialization():
+            return super().render(data, accepted_media_type, renderer_context)
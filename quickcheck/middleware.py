@@ -0,0 +1,137 @@
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.handlers.asgi import ASGIRequest
+from django.utils.decorators import sync_and_async_middleware
+
+from . import metrics, query_budget
+from .log import start_log_context
+from .routers import reset_request_state, set_request_user
+
+
+@sync_and_async_middleware
+def asgi_urlconf_middleware(get_response):
+    """
+    Resolves requests that arrive through the ASGI handler against
+    ASGI_ROOT_URLCONF, which routes the hot endpoints to native async views.
+    WSGI requests keep ROOT_URLCONF.
+    """
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            if isinstance(request, ASGIRequest):
+                request.urlconf = settings.ASGI_ROOT_URLCONF
+            return await get_response(request)
+    else:
+        def middleware(request):
+            if isinstance(request, ASGIRequest):
+                request.urlconf = settings.ASGI_ROOT_URLCONF
+            return get_response(request)
+
+    return middleware
+
+
+@sync_and_async_middleware
+def database_routing_middleware(get_response):
+    """
+    Clears the replica-routing state left by the previous request on this
+    thread / task and registers session-authenticated users (the admin) for
+    read-your-writes stickiness. JWT users are registered by
+    CachedJWTAuthentication.
+    """
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            reset_request_state()
+            if settings.DATABASE_REPLICAS and request.COOKIES.get(settings.SESSION_COOKIE_NAME):
+                user = await request.auser()
+                if user.is_authenticated:
+                    set_request_user(user.pk)
+            return await get_response(request)
+    else:
+        def middleware(request):
+            reset_request_state()
+            if settings.DATABASE_REPLICAS and request.COOKIES.get(settings.SESSION_COOKIE_NAME):
+                if request.user.is_authenticated:
+                    set_request_user(request.user.pk)
+            return get_response(request)
+
+    return middleware
+
+
+@sync_and_async_middleware
+def request_logging_middleware(get_response):
+    """
+    Gives every request a fresh log context with its request id: the
+    caller's X-Request-ID when sent, otherwise a new one. The id is echoed
+    in the response so clients can quote it.
+    """
+    def start(request):
+        return start_log_context(request.headers.get('X-Request-ID', '')[:64] or None)
+
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            request_id = start(request)
+            response = await get_response(request)
+            response['X-Request-ID'] = request_id
+            return response
+    else:
+        def middleware(request):
+            request_id = start(request)
+            response = get_response(request)
+            response['X-Request-ID'] = request_id
+            return response
+
+    return middleware
+
+
+@sync_and_async_middleware
+def metrics_middleware(get_response):
+    """
+    Records wall time, database queries and serialization time per view
+    for /metrics. Removed from the stack when METRICS_ENABLED is off.
+    """
+    if not settings.METRICS_ENABLED:
+        raise MiddlewareNotUsed
+    metrics.install()
+
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            request_metrics, token = metrics.start_request()
+            response = await get_response(request)
+            metrics.finish_request(request_metrics, token, request, response)
+            return response
+    else:
+        def middleware(request):
+            request_metrics, token = metrics.start_request()
+            response = get_response(request)
+            metrics.finish_request(request_metrics, token, request, response)
+            return response
+
+    return middleware
+
+
+@sync_and_async_middleware
+def query_budget_middleware(get_response):
+    """
+    Holds requests to URLs listed in QUERY_BUDGETS to their query budget
+    while QUERY_BUDGET_ENFORCE is on (see quickcheck/query_budget.py).
+    """
+    query_budget.install()
+
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            if not settings.QUERY_BUDGET_ENFORCE:
+                return await get_response(request)
+            recorder, token = query_budget.start_recording()
+            response = await get_response(request)
+            query_budget.finish_recording(recorder, token, request, response)
+            return response
+    else:
+        def middleware(request):
+            if not settings.QUERY_BUDGET_ENFORCE:
+                return get_response(request)
+            recorder, token = query_budget.start_recording()
+            response = get_response(request)
+            query_budget.finish_recording(recorder, token, request, response)
+            return response
+
+    return middleware
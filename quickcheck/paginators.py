@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+def estimated_row_count(model, using):
+    """
+    The table's row count according to the database's own bookkeeping, read
+    without scanning the table; None when the backend offers no estimate.
+    """
+    connection = connections[using]
+    table = connection.ops.quote_name(model._meta.db_table)
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            # The rowid b-tree's last key; exact until rows are deleted
+            cursor.execute(f"SELECT MAX(rowid) FROM {table}")
+        elif connection.vendor == 'postgresql':
+            # Planner statistics; -1 until the table has been analyzed
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [table])
+        else:
+            return None
+        row = cursor.fetchone()
+
+    if row is None or row[0] is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Changelist paginator that never runs an unbounded COUNT(*).
+
+    At most ADMIN_EXACT_COUNT_LIMIT + 1 rows are counted. Past that, an
+    unfiltered changelist reports the table's estimated size, and a filtered
+    one stops at the limit: narrow the filters to reach older rows. Pair it
+    with `show_full_result_count = False` so the admin skips its second count.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        limit = settings.ADMIN_EXACT_COUNT_LIMIT
+        counted = queryset.order_by()[:limit + 1].count()
+        if counted <= limit or queryset.query.where:
+            return counted
+
+        estimate = estimated_row_count(queryset.model, queryset.db)
+        return max(counted, estimate or 0)
@@ -0,0 +1,108 @@
+"""
+Per-endpoint query budgets.
+
+QUERY_BUDGETS maps URL names to the most queries one request may run.
+quickcheck.middleware.query_budget_middleware counts the queries of every
+request to a budgeted URL while QUERY_BUDGET_ENFORCE is on (DEBUG by
+default). With QUERY_BUDGET_ACTION 'log' an overrun is logged with each
+statement and the code that ran it; with 'raise' (the test suite) the
+request fails with QueryBudgetExceeded.
+"""
+import logging
+import traceback
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+# Recorder of the request being checked, shared with sync_to_async threads
+_current = ContextVar('query_budget_recorder', default=None)
+
+# Frames left out of the recorded stacks: the standard library, installed
+# packages and the middleware chain every request goes through
+IGNORED_PATHS = ('/lib/python', '<frozen', 'quickcheck/middleware.py')
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryRecorder:
+    """
+    Statements run during one request, each with the project frames that ran it.
+    """
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, sql, stack):
+        self.queries.append((sql, stack))
+
+    def report(self):
+        lines = []
+        for number, (sql, stack) in enumerate(self.queries, start=1):
+            lines.append(f"{number}. {sql}")
+            lines += [f"     {frame.filename}:{frame.lineno} in {frame.name}" for frame in stack]
+        return "\n".join(lines)
+
+
+def get_budget(url_name):
+    return settings.QUERY_BUDGETS.get(url_name)
+
+
+def start_recording():
+    recorder = QueryRecorder()
+    return recorder, _current.set(recorder)
+
+
+def finish_recording(recorder, token, request, response):
+    """
+    Checks the finished request against its budget.
+    """
+    _current.reset(token)
+    match = getattr(request, 'resolver_match', None)
+    budget = get_budget(match.url_name) if match else None
+    if budget is None:
+        return
+
+    response['X-Query-Count'] = str(len(recorder.queries))
+    if len(recorder.queries) <= budget:
+        return
+
+    message = (
+        f"{request.method} {request.path} ({match.url_name}) ran {len(recorder.queries)} "
+        f"queries, over its budget of {budget}:\n{recorder.report()}"
+    )
+    if settings.QUERY_BUDGET_ACTION == 'raise':
+        raise QueryBudgetExceeded(message)
+    logger.error(message)
+
+
+def query_recorder(execute, sql, params, many, context):
+    """
+    Execute wrapper feeding the current request's recorder, if any.
+    """
+    recorder = _current.get()
+    if recorder is not None:
+        stack = [
+            frame for frame in traceback.extract_stack()[:-1]
+            if not any(path in frame.filename for path in IGNORED_PATHS)
+        ]
+        recorder(sql, stack)
+    return execute(sql, params, many, context)
+
+
+def install_query_recorder(connection, **kwargs):
+    if query_recorder not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_recorder)
+
+
+def install():
+    """
+    Wraps every database connection, open or future, with query_recorder.
+    """
+    connection_created.connect(install_query_recorder, dispatch_uid='quickcheck_query_budget_recorder')
+    for connection in connections.all(initialized_only=True):
+        install_query_recorder(connection)
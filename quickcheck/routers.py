@@ -0,0 +1,75 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+# Set for the rest of the request (or block) once reads must see the primary
+_pinned = ContextVar('db_pinned_to_primary', default=False)
+_request_user = ContextVar('db_request_user', default=None)
+
+
+def sticky_key(user_id):
+    return f"db:recent_writer:{user_id}"
+
+
+@contextmanager
+def use_primary():
+    """
+    Sends every read inside the block to the primary, e.g. fraud checks that
+    must see the rows the same transaction (or the last request) just wrote.
+    """
+    token = _pinned.set(True)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+def set_request_user(user_id):
+    """
+    Records who the current request belongs to. A user who wrote within the
+    last DATABASE_REPLICA_STICKY_SECONDS reads from the primary, so they see
+    their own loan straight after submitting it.
+    """
+    _request_user.set(str(user_id))
+    if settings.DATABASE_REPLICAS and cache.get(sticky_key(user_id)):
+        _pinned.set(True)
+
+
+def reset_request_state():
+    _pinned.set(False)
+    _request_user.set(None)
+
+
+class PrimaryReplicaRouter:
+    """
+    Routes writes to `default` and reads to a random DATABASE_REPLICAS alias.
+    Reads stay on the primary inside a transaction, after the request has
+    written, inside use_primary(), and for users who wrote recently.
+    Without replicas every query goes to `default`.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas or _pinned.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        if not _pinned.get():
+            _pinned.set(True)
+            user_id = _request_user.get()
+            if user_id and settings.DATABASE_REPLICAS:
+                # Needs a shared cache (not LocMem) when several workers serve traffic
+                cache.set(sticky_key(user_id), True, settings.DATABASE_REPLICA_STICKY_SECONDS)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
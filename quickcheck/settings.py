@@ -51,19 +51,27 @@ AUTH_USER_MODEL = 'account.User'
 
 
 MIDDLEWARE = [
+    'quickcheck.middleware.request_logging_middleware',
+    'quickcheck.middleware.metrics_middleware',
+    'quickcheck.middleware.query_budget_middleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'quickcheck.middleware.database_routing_middleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'quickcheck.middleware.asgi_urlconf_middleware',
 ]
 
 
 
 ROOT_URLCONF = 'quickcheck.urls'
 
+# Requests served through quickcheck/asgi.py use the native async loan views
+ASGI_ROOT_URLCONF = 'quickcheck.asgi_urls'
+
 
 
 TEMPLATES = [
@@ -85,10 +93,18 @@ TEMPLATES = [
 UNFOLD = {
     "SITE_TITLE": "QuickCheck Admin",
     "SITE_HEADER": "QuickCheck",
-    "SHOW_COUNTS": True,
+    # Per-filter counts are a COUNT(*) each on every changelist
+    "SHOW_COUNTS": False,
     "COLLAPSIBLE_FILTERS": True,
+    "DASHBOARD_CALLBACK": "loan.stats.dashboard_callback",
 }
 
+# Days of loan statistics shown on the admin dashboard
+LOAN_STATS_DASHBOARD_DAYS = 14
+
+# Rows admin changelists count exactly before falling back to an estimate
+ADMIN_EXACT_COUNT_LIMIT = 10_000
+
 
 
 
@@ -137,16 +153,27 @@ REST_FRAMEWORK = {
     
     'DEFAULT_AUTHENTICATION_CLASSES': (
         
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'account.authentication.CachedJWTAuthentication',
     ), 
     # Pagination settings
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'PAGE_SIZE': 10, 
+    # JSON rendering counts towards the serialization time in /metrics
+    'DEFAULT_RENDERER_CLASSES': (
+        'quickcheck.metrics.TimedJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
     
 }
 
 
+# In-process cache of authenticated users (account.authentication.CachedJWTAuthentication)
+AUTH_USER_CACHE_SIZE = 1024
+AUTH_USER_CACHE_TTL = 60  # seconds
+
+
 WSGI_APPLICATION = 'quickcheck.wsgi.application'
+ASGI_APPLICATION = 'quickcheck.asgi.application'
 
 
 # Database
@@ -159,10 +186,67 @@ DATABASES = {
     }
 }
 
+# Read replicas, e.g. DATABASE_REPLICAS=replica.sqlite3 (comma-separated). Locally,
+# `python manage.py sync_replicas` copies the primary SQLite file into each replica.
+for number, path in enumerate(filter(None, os.getenv('DATABASE_REPLICAS', '').split(',')), start=1):
+    DATABASES[f'replica_{number}'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / path.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+# High-concurrency SQLite profile (Django 5.1+). WAL lets readers run alongside the
+# writer, BEGIN IMMEDIATE makes write transactions queue on the busy timeout instead
+# of failing with "database is locked", and connections are reused across requests.
+# Set SQLITE_PROFILE=default for Django's stock SQLite behaviour.
+SQLITE_PROFILE = os.getenv('SQLITE_PROFILE', 'concurrent')
+SQLITE_CONCURRENT_OPTIONS = {
+    'transaction_mode': 'IMMEDIATE',
+    'timeout': 20,  # seconds to wait for the write lock (busy_timeout)
+    'init_command': (
+        'PRAGMA journal_mode=WAL;'
+        'PRAGMA synchronous=NORMAL;'
+        'PRAGMA mmap_size=134217728;'  # 128 MiB
+        'PRAGMA cache_size=-20000;'  # ~20 MB page cache
+        'PRAGMA temp_store=MEMORY;'
+    ),
+}
+
+if SQLITE_PROFILE == 'concurrent':
+    for database in DATABASES.values():
+        database['OPTIONS'] = dict(SQLITE_CONCURRENT_OPTIONS)
+        # Persistent connections suit WSGI, where each worker thread reuses its
+        # own connection. Under ASGI every sync_to_async call may run on a new
+        # thread and keep another connection open, so reuse is opt-in
+        database['CONN_MAX_AGE'] = int(os.getenv('CONN_MAX_AGE', 0))
+        database['CONN_HEALTH_CHECKS'] = True
+    # WAL needs a real file, so tests use one instead of an in-memory database
+    DATABASES['default']['TEST'] = {'NAME': BASE_DIR / 'test_db.sqlite3'}
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['quickcheck.routers.PrimaryReplicaRouter']
+
+# Seconds a user's reads stay on the primary after they write (covers replica lag)
+DATABASE_REPLICA_STICKY_SECONDS = 10
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
+# Password hashing. The first hasher hashes new passwords; the rest only verify
+# existing hashes. Tune the work factor per environment (lower it for tests/dev).
+# account.hashers.PBKDF2PasswordHasher replaces Django's pbkdf2_sha256 hasher.
+PASSWORD_HASHERS = list(dict.fromkeys([
+    os.getenv('PASSWORD_HASHER', 'account.hashers.PBKDF2PasswordHasher'),
+    'account.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]))
+PASSWORD_HASH_ITERATIONS = int(os.getenv('PASSWORD_HASH_ITERATIONS', 1_000_000))
+
+# Threads hashing passwords for the async login/registration views (account.hashers)
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 4))
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -183,38 +267,116 @@ AUTH_PASSWORD_VALIDATORS = [
 
 
 
+# Most queries one request to each URL name may run (quickcheck/query_budget.py),
+# counted with a cold authenticated-user cache. Each budget is the worst case of
+# the statements listed next to it; "atomic" is the transaction's opening and
+# closing statement (a savepoint pair inside the test suite's transaction)
+QUERY_BUDGETS = {
+    # account/urls.py
+    # 2 duplicate-email checks, atomic, user INSERT, domain counter UPDATE,
+    # plus atomic and INSERT when the domain is new
+    'register': 9,
+    # user SELECT, OutstandingToken INSERT
+    'login': 2,
+    # simplejwt TokenRefreshView: blacklist check, user SELECT (active check),
+    # blacklist(): user SELECT and get_or_create of the OutstandingToken (SELECT)
+    # and BlacklistedToken (SELECT, atomic, INSERT), then outstand() for the
+    # rotated token: user SELECT and OutstandingToken get_or_create
+    # (SELECT, atomic, INSERT)
+    'token_refresh': 13,
+    # authenticated user, blacklist check, then blacklist() as in token_refresh
+    'logout_view': 8,
+    # loan/urls.py (and loan/async_urls.py)
+    # authenticated user, atomic, velocity bucket UPDATE (plus atomic and INSERT
+    # for the first submission in the hour), window SUM, recent-loan COUNT,
+    # email domain count, loan INSERT, daily stat upsert, fraud flag INSERT,
+    # pending alert INSERT
+    'loan_request': 14,
+    # loan_request's statements, with its three inserts split into SQLite's
+    # 999-parameter batches for LOAN_BULK_MAX_ITEMS (1000) flagged items:
+    # 7 loan INSERTs, 7 fraud flag INSERTs (3 rules each), 3 alert INSERTs
+    'bulk_loan_request': 28,
+    # authenticated user, page count, page rows
+    'retrieve_all_loans': 3,
+    # authenticated user, loan SELECT, atomic, UPDATE, daily stat upsert
+    'update_loan_status': 6,
+    # authenticated user, rollup aggregate, UPDATE, daily stat upsert
+    'bulk_update_loan_status': 4,
+    # authenticated user, page count, page rows
+    'flagged_loans': 3,
+    # authenticated user, rollup SELECT
+    'loan_stats': 2,
+}
+# Count queries against QUERY_BUDGETS; overruns are logged ('log') or raise ('raise')
+QUERY_BUDGET_ENFORCE = os.getenv('QUERY_BUDGET_ENFORCE', str(DEBUG)).lower() == 'true'
+QUERY_BUDGET_ACTION = os.getenv('QUERY_BUDGET_ACTION', 'log')
+
+# Per-view latency, query and fraud-rule histograms served at /metrics
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True').lower() == 'true'
+# Clients (addresses or networks) allowed to scrape /metrics without an admin
+# session; empty means staff only. Matched against REMOTE_ADDR, so behind a
+# reverse proxy on the same host every client looks like 127.0.0.1: only list
+# loopback when nothing is proxied to this server
+METRICS_ALLOWED_IPS = [
+    network.strip() for network in os.getenv('METRICS_ALLOWED_IPS', '').split(',') if network.strip()
+]
+
+# 'json' writes one JSON object per record (request_id, user_id, loan_id
+# included); 'text' keeps the human-readable console format
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text')
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,  
+    'filters': {
+        'context': {
+            '()': 'quickcheck.log.ContextFilter',
+        },
+    },
     'formatters': {
         'standard': {
             'format': '[{levelname}] {asctime} {name} - {message}',
             'style': '{',
         },
+        'json': {
+            '()': 'quickcheck.log.JsonFormatter',
+        },
     },
     'handlers': {
         'console': {
             'class': 'logging.StreamHandler',
-            'formatter': 'standard',
+            'formatter': 'json' if LOG_FORMAT == 'json' else 'standard',
+        },
+        # Request threads only enqueue; a listener thread formats and writes
+        'queue': {
+            '()': 'quickcheck.log.QueueListenerHandler',
+            'handlers': ['cfg://handlers.console'],
+            'filters': ['context'],
         },
     },
     'loggers': {
         'django': {  # core Django logs
-            'handlers': ['console'],
+            'handlers': ['queue'],
             'level': 'INFO',
             'propagate': True,
         },
         # custom app-level logs 
         'account.views': {
-            'handlers': ['console'],
+            'handlers': ['queue'],
             'level': 'DEBUG',  
             'propagate': False,
         },
         'loan': {
-        'handlers': ['console'],
+        'handlers': ['queue'],
         'level': 'DEBUG',
         'propagate': False,
-        }
+        },
+        # query budget overruns
+        'quickcheck': {
+            'handlers': ['queue'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
 
@@ -246,6 +408,23 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
 
+# Fraud checks
+# Rules (see loan.fraud.RULE_REGISTRY) run cheapest first; short-circuit stops at the first hit
+LOAN_FRAUD_RULES = ['amount_cap', 'velocity', 'shared_email_domain']
+LOAN_FRAUD_SHORT_CIRCUIT = False
+LOAN_FRAUD_AMOUNT_CAP = 5_000_000  # ₦
+LOAN_FRAUD_VELOCITY_LIMIT = 3  # loans per 24 hours, including the new one
+LOAN_FRAUD_DOMAIN_LIMIT = 10  # users per email domain
+
+# 'async' queues them for `manage.py fraud_worker`, 'sync' runs them inside the request
+LOAN_FRAUD_CHECK_MODE = os.getenv('LOAN_FRAUD_CHECK_MODE', 'async')
+LOAN_FRAUD_JOB_BATCH_SIZE = 100
+LOAN_FRAUD_JOB_MAX_ATTEMPTS = 3
+LOAN_FRAUD_JOB_LEASE = 300  # seconds before a running job is considered abandoned
+LOAN_BULK_MAX_ITEMS = 1000  # largest batch accepted by the bulk submission endpoint
+
+
+
 # Email backend
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'smtp.gmail.com'
@@ -254,3 +433,14 @@ EMAIL_USE_TLS = True
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
+
+# Outbox delivery (`manage.py send_outbox`)
+LOAN_OUTBOX_BATCH_SIZE = 50
+LOAN_OUTBOX_MAX_ATTEMPTS = 5
+LOAN_OUTBOX_RETRY_BACKOFF = 30  # seconds, doubled after every failed attempt
+LOAN_OUTBOX_LEASE = 300  # seconds a claimed batch is hidden from other senders
+LOAN_ALERT_RECIPIENTS_TTL = 300  # seconds the superuser recipient list is cached
+
+# Fraud alerts are collected into one digest per window; 0 sends one email per loan
+LOAN_ALERT_DIGEST_WINDOW = int(os.getenv('LOAN_ALERT_DIGEST_WINDOW', 60))  # seconds
+LOAN_ALERT_DIGEST_MAX_LOANS = 100  # send early once this many loans are waiting
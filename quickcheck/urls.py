@@ -1,9 +1,11 @@
 
 from django.contrib import admin
 from django.urls import path, include
+from .views import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('account/', include('account.urls')),
     path('loan/', include('loan.urls')),
+    path('metrics', metrics_view, name='metrics'),
 ]
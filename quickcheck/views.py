@@ -0,0 +1,27 @@
+import ipaddress
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+
+from .metrics import registry
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint. Open to staff users logged in to the admin
+    and, when configured, to clients in METRICS_ALLOWED_IPS.
+    """
+    if not settings.METRICS_ENABLED:
+        raise Http404
+
+    if not (client_allowed(request) or request.user.is_staff):
+        return HttpResponseForbidden()
+
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+def client_allowed(request):
+    try:
+        address = ipaddress.ip_address(request.META.get('REMOTE_ADDR', ''))
+    except ValueError:
+        return False
+    return any(address in ipaddress.ip_network(network) for network in settings.METRICS_ALLOWED_IPS)